@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import time
+
+from bench.synthetic import STEP, SyntheticFeed
+from engine.data import EventAggregator
+
+FEED_COUNTS = [2, 10, 100, 1000, 5000]
+
+
+def make_aggregator(feed_count: int, events: int) -> EventAggregator:
+    aggregator = EventAggregator(asyncio.new_event_loop())
+    per_feed = max(1, events // feed_count)
+    for i in range(feed_count):
+        # spread the feeds inside one step, so the merge actually interleaves them
+        offset = STEP * i // feed_count
+        aggregator.feeds.append(SyntheticFeed(per_feed, offset))
+    return aggregator
+
+
+async def drain(aggregator: EventAggregator) -> int:
+    count = 0
+    while True:
+        event = aggregator.next_historical()
+        if event is None:
+            event = await aggregator.next()
+            if event is None:
+                break
+        count += 1
+    return count
+
+
+def run(feed_count: int, events: int):
+    aggregator = make_aggregator(feed_count, events)
+    aggregator.start()
+    start = time.perf_counter()
+    count = aggregator.loop.run_until_complete(drain(aggregator))
+    elapsed = time.perf_counter() - start
+    aggregator.stop()
+    aggregator.loop.close()
+    return count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EventAggregator merge throughput")
+    parser.add_argument("--events", type=int, default=200000, help="total events per run")
+    parser.add_argument("--feeds", type=int, nargs="*", default=FEED_COUNTS, help="feed counts to measure")
+    args = parser.parse_args()
+    print(f"{'feeds':>8} {'events':>10} {'seconds':>10} {'events/sec':>12}")
+    for feed_count in args.feeds:
+        count, elapsed = run(feed_count, args.events)
+        print(f"{feed_count:>8} {count:>10} {elapsed:>10.3f} {count / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
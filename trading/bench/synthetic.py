@@ -0,0 +1,115 @@
+from datetime import datetime, timezone
+import typing
+
+import numpy
+
+from engine.bar.event import BarBatch, BarEvent
+from engine.bar.feed import BarFeed
+from engine.bar.history import BarHistory
+from engine.feed import Event, EventFeed, datetime_to_ns
+
+START = datetime_to_ns(datetime(2000, 1, 1, tzinfo=timezone.utc))
+STEP = 60 * 1000000000
+CHUNK_SIZE = 4096
+
+
+class SyntheticFeed(EventFeed[Event]):
+    """
+    Plain events at a fixed step, without any payload.
+    """
+    timestamps: typing.List[int]
+    index: int
+
+    def __init__(self, count: int, offset: int):
+        self.timestamps = [START + offset + STEP * i for i in range(count)]
+        self.index = 0
+
+    def _historical_next(self) -> Event|None:
+        if self.index >= len(self.timestamps):
+            return None
+        event = Event(self.timestamps[self.index])
+        self.index += 1
+        return event
+
+    async def _live_next(self) -> Event|None:
+        return None
+
+
+class SyntheticBarHistory(BarHistory):
+    """
+    Random walk bars at a fixed step, generated chunk by chunk,
+    so producing them costs about as much as decoding stored columns.
+    """
+    count: int
+    offset: int
+    seed: int
+    produced: int
+    chunk: BarBatch|None
+    chunk_index: int
+    price: float
+    rng: numpy.random.Generator
+
+    def __init__(self, count: int, offset: int = 0, seed: int = 0):
+        self.count = count
+        self.offset = offset
+        self.seed = seed
+
+    def start(self):
+        self.produced = 0
+        self.chunk = None
+        self.chunk_index = 0
+        self.price = 100.0
+        self.rng = numpy.random.default_rng(self.seed)
+
+    def _next_chunk(self) -> bool:
+        size = min(CHUNK_SIZE, self.count - self.produced)
+        if size <= 0:
+            self.chunk = None
+            return False
+        first = START + self.offset + STEP * self.produced
+        close = self.price * numpy.exp(numpy.cumsum(self.rng.normal(0.0, 0.001, size)))
+        open = numpy.concatenate(([self.price], close[:-1]))
+        spread = numpy.abs(self.rng.normal(0.0, 0.0005, size)) * close
+        self.chunk = BarBatch(
+            timestamps=first + STEP * numpy.arange(size, dtype=numpy.int64),
+            open=open,
+            high=numpy.maximum(open, close) + spread,
+            low=numpy.minimum(open, close) - spread,
+            close=close,
+            volume=self.rng.integers(100, 10000, size).astype(numpy.float64),
+        )
+        self.chunk_index = 0
+        self.produced += size
+        self.price = float(close[-1])
+        return True
+
+    def next(self) -> BarEvent|None:
+        if self.chunk is None or self.chunk_index >= len(self.chunk):
+            if not self._next_chunk():
+                return None
+        bar = self.chunk.bar(self.chunk_index)
+        self.chunk_index += 1
+        return bar
+
+    def next_batch(self, count: int) -> BarBatch|None:
+        if self.chunk is None or self.chunk_index >= len(self.chunk):
+            if not self._next_chunk():
+                return None
+        start = self.chunk_index
+        self.chunk_index = min(start + count, len(self.chunk))
+        return self.chunk[start:self.chunk_index]
+
+
+def make_bar_feeds(feed_count: int, bars: int, batch_size: int|None = None) -> typing.List[BarFeed]:
+    """
+    Splits the bars evenly across the feeds,
+    with the feeds spread inside one step so the merge has to interleave them.
+    """
+    per_feed = max(1, bars // feed_count)
+    feeds = []
+    for i in range(feed_count):
+        feed = BarFeed()
+        feed.history = SyntheticBarHistory(per_feed, STEP * i // feed_count, seed=i)
+        feed.batch_size = batch_size
+        feeds.append(feed)
+    return feeds
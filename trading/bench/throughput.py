@@ -0,0 +1,151 @@
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+import json
+import platform
+import sys
+import typing
+
+import numpy
+
+from bench.synthetic import make_bar_feeds
+from engine.data import EventAggregator
+from engine.engine import Engine
+from engine.profiler import Profiler
+
+FEED_COUNTS = [1, 10, 100, 1000]
+
+
+class NullEngine(Engine):
+    dispatched: int = 0
+
+    def process(self, event):
+        self.dispatched += 1
+
+
+def peak_rss() -> int|None:
+    """
+    Peak resident set size of the current process in bytes.
+    """
+    try:
+        import resource
+    except ImportError:
+        return _windows_peak_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _windows_peak_rss() -> int|None:
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def run_configuration(bars: int, feed_count: int, batch_size: int|None) -> typing.Dict[str, typing.Any]:
+    """
+    Measures one configuration in a single profiled Engine run.
+    Decode and merge times come from the Profiler, dispatch is the rest of the run:
+    iterating batches, building events and calling the handler, which the Profiler times per event.
+    Throughput counts the events that reached the handler.
+    """
+    loop = asyncio.new_event_loop()
+    aggregator = EventAggregator(loop)
+    aggregator.feeds.extend(make_bar_feeds(feed_count, bars, batch_size))
+    engine = NullEngine(loop)
+    engine.aggregator = aggregator
+    engine.profiler = Profiler()
+    engine.run()
+    loop.close()
+    summary = engine.profiler.summary()
+    total = summary["elapsed_seconds"]
+    return {
+        "bars": bars,
+        "feeds": feed_count,
+        "batch_size": batch_size,
+        "events": engine.dispatched,
+        "merged_blocks": summary["merge"]["count"],
+        "decode_seconds": sum(timing["total_seconds"] for timing in summary["decode"].values()),
+        "merge_seconds": summary["merge"]["exclusive_seconds"],
+        "dispatch_seconds": total - summary["merge"]["total_seconds"],
+        "total_seconds": total,
+        "bars_per_sec": engine.dispatched / total if total else None,
+        "peak_rss_bytes": peak_rss(),
+    }
+
+
+def compare(results: typing.List[typing.Dict[str, typing.Any]], baseline_path: str):
+    with open(baseline_path, "rt", encoding="utf-8") as fh:
+        baseline = json.load(fh)
+    previous = {(r["bars"], r["feeds"], r["batch_size"]): r for r in baseline["results"]}
+    print(f"compared to {baseline.get('label') or baseline_path}:")
+    for result in results:
+        old = previous.get((result["bars"], result["feeds"], result["batch_size"]))
+        if old is None or not old["bars_per_sec"]:
+            continue
+        ratio = result["bars_per_sec"] / old["bars_per_sec"]
+        print(f"{result['feeds']:>8} feeds: {ratio:.2f}x bars/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Engine throughput on synthetic bar feeds")
+    parser.add_argument("--bars", type=int, default=1000000, help="total bars per configuration")
+    parser.add_argument("--feeds", type=int, nargs="*", default=FEED_COUNTS, help="feed counts to measure")
+    parser.add_argument("--batch-size", type=int, default=None, help="replay history as batches of this size")
+    parser.add_argument("--label", default="", help="name of this run in the output")
+    parser.add_argument("--output", default=None, help="JSON file to write the results to")
+    parser.add_argument("--baseline", default=None, help="earlier JSON output to compare against")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'feeds':>8} {'events':>10} {'decode':>8} {'merge':>8} {'dispatch':>8} {'total':>8} {'bars/sec':>10} {'peak MB':>8}")
+    for feed_count in args.feeds:
+        # every configuration runs in its own process, so peak RSS is not shared between them
+        with ProcessPoolExecutor(1) as pool:
+            result = pool.submit(run_configuration, args.bars, feed_count, args.batch_size).result()
+        results.append(result)
+        peak = result["peak_rss_bytes"]
+        print(
+            f"{feed_count:>8} {result['events']:>10} "
+            f"{result['decode_seconds']:>8.3f} {result['merge_seconds']:>8.3f} "
+            f"{result['dispatch_seconds']:>8.3f} {result['total_seconds']:>8.3f} "
+            f"{result['bars_per_sec']:>10.0f} {peak / 1e6 if peak else 0:>8.1f}"
+        )
+
+    if args.output:
+        report = {
+            "label": args.label,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": numpy.__version__,
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(args.output, "wt", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
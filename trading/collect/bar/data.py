@@ -1,86 +1,427 @@
-from datetime import datetime
-import io
-import struct
-
-
-class Bar:
-    MARKER = "BAR8"
-    BINARY_SIZE = 8 + 4*8 + 8
-    BINARY_FORMAT = "<QQQQQQ"
-    FIXED_POINT_MULTIPLIER = 1000000
-    
-    __slots__ = ("date", "iopen", "ihigh", "ilow", "iclose", "volume")
-    date: datetime
-    iopen: int
-    ihigh: int
-    ilow: int
-    iclose: int
-    volume: int
-
-    def __init__(self, date: datetime, iopen: int, ihigh: int, ilow: int, iclose: int, volume: int):
-        self.date = date
-        self.iopen = iopen
-        self.ihigh = ihigh
-        self.ilow = ilow
-        self.iclose = iclose
-        self.volume = volume
-
-    def write(self, stream: io.BytesIO):
-        buffer = struct.pack(
-            self.BINARY_FORMAT,
-            self.date.timestamp(),
-            self.iopen,
-            self.ihigh,
-            self.ilow,
-            self.iclose,
-            self.volume,
-        )
-        stream.write(buffer)
-
-    @classmethod
-    def read(cls, stream: io.BytesIO):
-        buffer = stream.read(cls.BINARY_SIZE)
-        data = struct.unpack(cls.BINARY_FORMAT, buffer)
-        return Bar(
-            date=datetime.fromtimestamp(data[0]),
-            iopen=data[1],
-            ihigh=data[2],
-            ilow = data[3],
-            iclose = data[4],
-            volume = data[5],
-        )
-    
-    def __repr__(self):
-        return f"Bar({self.date}, {self.iopen}, {self.ihigh}, {self.ilow}, {self.iclose}, {self.volume})"
-    
-    @property
-    def open(self):
-        return self.iopen / self.FIXED_POINT_MULTIPLIER
-    
-    @open.setter
-    def open(self, value):
-        self.iopen = int(value * self.FIXED_POINT_MULTIPLIER)
-
-    @property
-    def high(self):
-        return self.ihigh / self.FIXED_POINT_MULTIPLIER
-    
-    @high.setter
-    def high(self, value):
-        self.ihigh = int(value * self.FIXED_POINT_MULTIPLIER)
-
-    @property
-    def low(self):
-        return self.ilow / self.FIXED_POINT_MULTIPLIER
-    
-    @low.setter
-    def low(self, value):
-        self.ilow = int(value * self.FIXED_POINT_MULTIPLIER)
-
-    @property
-    def close(self):
-        return self.iclose / self.FIXED_POINT_MULTIPLIER
-    
-    @close.setter
-    def close(self, value):
-        self.iclose = int(value * self.FIXED_POINT_MULTIPLIER)
+import collections
+from datetime import datetime
+import io
+import os
+import struct
+import typing
+import zlib
+
+import numpy
+
+
+class Bar:
+    MARKER = "BAR8"
+    BINARY_SIZE = 8 + 4*8 + 8
+    BINARY_FORMAT = "<QQQQQQ"
+    FIXED_POINT_MULTIPLIER = 1000000
+    DTYPE = numpy.dtype([
+        ("timestamp", "<u8"),
+        ("open", "<u8"),
+        ("high", "<u8"),
+        ("low", "<u8"),
+        ("close", "<u8"),
+        ("volume", "<u8"),
+    ])
+    
+    __slots__ = ("date", "iopen", "ihigh", "ilow", "iclose", "volume")
+    date: datetime
+    iopen: int
+    ihigh: int
+    ilow: int
+    iclose: int
+    volume: int
+
+    def __init__(self, date: datetime, iopen: int, ihigh: int, ilow: int, iclose: int, volume: int):
+        self.date = date
+        self.iopen = iopen
+        self.ihigh = ihigh
+        self.ilow = ilow
+        self.iclose = iclose
+        self.volume = volume
+
+    def write(self, stream: io.BytesIO):
+        buffer = struct.pack(
+            self.BINARY_FORMAT,
+            int(self.date.timestamp()),
+            self.iopen,
+            self.ihigh,
+            self.ilow,
+            self.iclose,
+            self.volume,
+        )
+        stream.write(buffer)
+
+    @classmethod
+    def read(cls, stream: io.BytesIO):
+        buffer = stream.read(cls.BINARY_SIZE)
+        data = struct.unpack(cls.BINARY_FORMAT, buffer)
+        return Bar(
+            date=datetime.fromtimestamp(data[0]),
+            iopen=data[1],
+            ihigh=data[2],
+            ilow = data[3],
+            iclose = data[4],
+            volume = data[5],
+        )
+    
+    def __repr__(self):
+        return f"Bar({self.date}, {self.iopen}, {self.ihigh}, {self.ilow}, {self.iclose}, {self.volume})"
+    
+    @property
+    def open(self):
+        return self.iopen / self.FIXED_POINT_MULTIPLIER
+    
+    @open.setter
+    def open(self, value):
+        self.iopen = int(value * self.FIXED_POINT_MULTIPLIER)
+
+    @property
+    def high(self):
+        return self.ihigh / self.FIXED_POINT_MULTIPLIER
+    
+    @high.setter
+    def high(self, value):
+        self.ihigh = int(value * self.FIXED_POINT_MULTIPLIER)
+
+    @property
+    def low(self):
+        return self.ilow / self.FIXED_POINT_MULTIPLIER
+    
+    @low.setter
+    def low(self, value):
+        self.ilow = int(value * self.FIXED_POINT_MULTIPLIER)
+
+    @property
+    def close(self):
+        return self.iclose / self.FIXED_POINT_MULTIPLIER
+    
+    @close.setter
+    def close(self, value):
+        self.iclose = int(value * self.FIXED_POINT_MULTIPLIER)
+
+
+class BarRecords:
+    """
+    BAR8 records decoded in bulk into a NumPy structured array (Bar.DTYPE).
+    BAR9 files are decompressed into the same records.
+    Prices are available as float columns converted from fixed point in one step,
+    Bar objects are only built on request.
+    """
+    records: numpy.ndarray
+
+    def __init__(self, records: numpy.ndarray):
+        self.records = records
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes) -> "BarRecords":
+        return BarRecords(numpy.frombuffer(buffer, dtype=Bar.DTYPE, count=len(buffer) // Bar.BINARY_SIZE))
+
+    @classmethod
+    def from_file(cls, path: str, start: int = 0, stop: int|None = None) -> "BarRecords":
+        """
+        Memory-maps the records of a BAR8 file, or the records from start to stop.
+        """
+        marker = read_marker(path)
+        if marker == ChunkedBarFile.MARKER:
+            return BarRecords(ChunkedBarFile(path).read(start, stop))
+        if marker != Bar.MARKER:
+            raise Exception(f"Existing marker {marker} does not match {Bar.MARKER}")
+        count = (os.path.getsize(path) - len(Bar.MARKER)) // Bar.BINARY_SIZE
+        stop = count if stop is None else min(stop, count)
+        if stop <= start:
+            return BarRecords(numpy.empty(0, dtype=Bar.DTYPE))
+        offset = len(Bar.MARKER) + start * Bar.BINARY_SIZE
+        return BarRecords(numpy.memmap(path, dtype=Bar.DTYPE, mode="r", offset=offset, shape=(stop - start,)))
+
+    @classmethod
+    def concatenate(cls, parts: typing.List["BarRecords"]) -> "BarRecords":
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return BarRecords(numpy.empty(0, dtype=Bar.DTYPE))
+        return BarRecords(numpy.concatenate([part.records for part in parts]))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def timestamps(self) -> numpy.ndarray:
+        """
+        Epoch seconds.
+        """
+        return self.records["timestamp"]
+
+    @property
+    def open(self) -> numpy.ndarray:
+        return self.records["open"] / Bar.FIXED_POINT_MULTIPLIER
+
+    @property
+    def high(self) -> numpy.ndarray:
+        return self.records["high"] / Bar.FIXED_POINT_MULTIPLIER
+
+    @property
+    def low(self) -> numpy.ndarray:
+        return self.records["low"] / Bar.FIXED_POINT_MULTIPLIER
+
+    @property
+    def close(self) -> numpy.ndarray:
+        return self.records["close"] / Bar.FIXED_POINT_MULTIPLIER
+
+    @property
+    def volume(self) -> numpy.ndarray:
+        return self.records["volume"]
+
+    def to_bars(self) -> typing.List[Bar]:
+        return [
+            Bar(datetime.fromtimestamp(timestamp), iopen, ihigh, ilow, iclose, volume)
+            for timestamp, iopen, ihigh, ilow, iclose, volume in self.records.tolist()
+        ]
+
+
+def read_marker(path: str) -> str:
+    with open(path, "rb") as fh:
+        return fh.read(len(Bar.MARKER)).decode("ascii")
+
+
+def zigzag_encode(values: numpy.ndarray) -> numpy.ndarray:
+    """
+    Maps signed integers to unsigned ones so that small magnitudes stay small.
+    """
+    values = values.astype(numpy.int64)
+    return ((values << 1) ^ (values >> 63)).astype(numpy.uint64)
+
+
+def zigzag_decode(values: numpy.ndarray) -> numpy.ndarray:
+    values = values.astype(numpy.uint64)
+    return (values >> numpy.uint64(1)).astype(numpy.int64) ^ -(values & numpy.uint64(1)).astype(numpy.int64)
+
+
+class ChunkedBarFile:
+    """
+    A BAR9 file, the compressed counterpart of BAR8.
+    Records are stored in chunks of CHUNK_SIZE (the last one may be shorter), each compressed on its own.
+    Within a chunk every field is a column, timestamps and prices as zig-zag encoded deltas,
+    split into byte planes so the zero high bytes of small values compress away.
+    An index with the first and last timestamp, offset, size and count of every chunk follows the chunks,
+    and a trailer at the very end holds the offset of the index and the number of chunks.
+    Reading a range only decompresses the chunks it overlaps.
+    Appends are journaled, see append().
+    """
+    MARKER = "BAR9"
+    CHUNK_SIZE = 4096
+    COMPRESSION_LEVEL = 6
+    # the boundary chunks of a range, found by lower_bound() and read right after
+    CACHED_CHUNKS = 2
+    JOURNAL_SUFFIX = ".journal"
+    JOURNAL_HEADER = "<Q"
+    TRAILER = "<QQ"
+    INDEX_DTYPE = numpy.dtype([
+        ("first", "<u8"),
+        ("last", "<u8"),
+        ("offset", "<u8"),
+        ("size", "<u8"),
+        ("count", "<u8"),
+    ])
+    DELTA_FIELDS = ("timestamp", "open", "high", "low", "close")
+
+    path: str
+    index: numpy.ndarray
+    index_offset: int
+    starts: numpy.ndarray
+    cache: typing.OrderedDict[int, numpy.ndarray]
+
+    def __init__(self, path: str):
+        self.path = path
+        self._load()
+
+    def _load(self):
+        with open(self.path, "rb") as fh:
+            marker = fh.read(len(self.MARKER)).decode("ascii")
+            if marker != self.MARKER:
+                raise Exception(f"Existing marker {marker} does not match {self.MARKER}")
+            fh.seek(-struct.calcsize(self.TRAILER), os.SEEK_END)
+            self.index_offset, chunks = struct.unpack(self.TRAILER, fh.read(struct.calcsize(self.TRAILER)))
+            fh.seek(self.index_offset, os.SEEK_SET)
+            self.index = numpy.frombuffer(fh.read(chunks * self.INDEX_DTYPE.itemsize), dtype=self.INDEX_DTYPE)
+        # record number of the first record of every chunk, and the total count
+        self.starts = numpy.concatenate(([0], numpy.cumsum(self.index["count"], dtype=numpy.int64)))
+        self.cache = collections.OrderedDict()
+
+    @classmethod
+    def encode_chunk(cls, records: numpy.ndarray) -> bytes:
+        columns = []
+        for field in Bar.DTYPE.names:
+            values = records[field]
+            if field in cls.DELTA_FIELDS:
+                values = zigzag_encode(numpy.diff(values.astype(numpy.int64), prepend=0))
+            columns.append(numpy.ascontiguousarray(values, dtype="<u8").view(numpy.uint8).reshape(-1, 8).T)
+        return zlib.compress(numpy.concatenate(columns).tobytes(), cls.COMPRESSION_LEVEL)
+
+    @classmethod
+    def decode_chunk(cls, data: bytes, count: int) -> numpy.ndarray:
+        planes = numpy.frombuffer(zlib.decompress(data), dtype=numpy.uint8).reshape(-1, count)
+        records = numpy.empty(count, dtype=Bar.DTYPE)
+        for column, field in enumerate(Bar.DTYPE.names):
+            values = numpy.ascontiguousarray(planes[column * 8:(column + 1) * 8].T).view("<u8").reshape(count)
+            if field in cls.DELTA_FIELDS:
+                values = numpy.cumsum(zigzag_decode(values)).astype(numpy.uint64)
+            records[field] = values
+        return records
+
+    @classmethod
+    def _write_chunks(cls, fh, records: numpy.ndarray, chunk_size: int) -> numpy.ndarray:
+        index = numpy.empty((len(records) + chunk_size - 1) // chunk_size, dtype=cls.INDEX_DTYPE)
+        for number, start in enumerate(range(0, len(records), chunk_size)):
+            chunk = records[start:start + chunk_size]
+            data = cls.encode_chunk(chunk)
+            index[number] = (chunk["timestamp"][0], chunk["timestamp"][-1], fh.tell(), len(data), len(chunk))
+            fh.write(data)
+        return index
+
+    @classmethod
+    def _write_index(cls, fh, index: numpy.ndarray):
+        offset = fh.tell()
+        fh.write(index.astype(cls.INDEX_DTYPE).tobytes())
+        fh.write(struct.pack(cls.TRAILER, offset, len(index)))
+
+    @classmethod
+    def write(cls, path: str, records: numpy.ndarray, chunk_size: int = CHUNK_SIZE) -> "ChunkedBarFile":
+        """
+        Writes sorted BAR8 records (Bar.DTYPE) as a BAR9 file.
+        The file is written next to the path and moved over it once complete.
+        """
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as fh:
+            fh.write(cls.MARKER.encode("ascii"))
+            cls._write_index(fh, cls._write_chunks(fh, records, chunk_size))
+        os.replace(temporary, path)
+        return ChunkedBarFile(path)
+
+    def append(self, records: numpy.ndarray, chunk_size: int = CHUNK_SIZE):
+        """
+        Appends records newer than the stored ones, in place.
+        A short last chunk is filled up first.
+        The new chunks, index and trailer are written over the old index (or the short chunk),
+        the bytes they replace are saved to a journal next to the file first.
+        A failed append is rolled back right away, one cut short by a crash by recover().
+        """
+        index = self.index
+        offset = self.index_offset
+        if len(index) and index["count"][-1] < chunk_size:
+            records = numpy.concatenate((self.chunk(len(index) - 1), records))
+            offset = int(index["offset"][-1])
+            index = index[:-1]
+        with open(self.path, "rb") as fh:
+            fh.seek(offset, os.SEEK_SET)
+            replaced = fh.read()
+        journal = self.path + self.JOURNAL_SUFFIX
+        self._write_journal(journal, offset, replaced)
+        try:
+            with open(self.path, "r+b") as fh:
+                fh.seek(offset, os.SEEK_SET)
+                self._write_index(fh, numpy.concatenate((index, self._write_chunks(fh, records, chunk_size))))
+                fh.truncate()
+                fh.flush()
+                os.fsync(fh.fileno())
+        except BaseException:
+            # after the file is closed, so nothing buffered is written over the rollback
+            self.recover(self.path)
+            raise
+        os.remove(journal)
+        self._load()
+
+    @classmethod
+    def _write_journal(cls, path: str, offset: int, data: bytes):
+        # complete and on disk before the file is touched, an existing journal is always whole
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as fh:
+            fh.write(struct.pack(cls.JOURNAL_HEADER, offset))
+            fh.write(data)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(temporary, path)
+
+    @classmethod
+    def recover(cls, path: str) -> bool:
+        """
+        Rolls back an append that did not complete, by writing the bytes saved in its journal back.
+        Called by writers before they open the file.
+        Returns True if there was anything to roll back.
+        """
+        journal = path + cls.JOURNAL_SUFFIX
+        if not os.path.isfile(journal):
+            return False
+        with open(journal, "rb") as fh:
+            offset, = struct.unpack(cls.JOURNAL_HEADER, fh.read(struct.calcsize(cls.JOURNAL_HEADER)))
+            data = fh.read()
+        with open(path, "r+b") as fh:
+            fh.seek(offset, os.SEEK_SET)
+            fh.write(data)
+            fh.truncate()
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.remove(journal)
+        return True
+
+    def __len__(self) -> int:
+        return int(self.starts[-1])
+
+    @property
+    def first_timestamp(self) -> int|None:
+        return int(self.index["first"][0]) if len(self.index) else None
+
+    @property
+    def last_timestamp(self) -> int|None:
+        return int(self.index["last"][-1]) if len(self.index) else None
+
+    def chunk(self, number: int, keep: bool = True) -> numpy.ndarray:
+        """
+        Decompresses one chunk, the last CACHED_CHUNKS decompressed and kept are cached.
+        """
+        records = self.cache.get(number)
+        if records is not None:
+            self.cache.move_to_end(number)
+            return records
+        entry = self.index[number]
+        with open(self.path, "rb") as fh:
+            fh.seek(int(entry["offset"]), os.SEEK_SET)
+            data = fh.read(int(entry["size"]))
+        records = self.decode_chunk(data, int(entry["count"]))
+        if keep:
+            self.cache[number] = records
+            if len(self.cache) > self.CACHED_CHUNKS:
+                self.cache.popitem(last=False)
+        return records
+
+    def lower_bound(self, timestamp: float) -> int:
+        """
+        Record number of the first record at or after the timestamp (in epoch seconds),
+        found through the index and a single decompressed chunk.
+        """
+        number = int(numpy.searchsorted(self.index["last"], timestamp))
+        if number >= len(self.index):
+            return len(self)
+        return int(self.starts[number]) + int(numpy.searchsorted(self.chunk(number)["timestamp"], timestamp))
+
+    def iter_records(self, start: int = 0, stop: int|None = None) -> typing.Iterator[numpy.ndarray]:
+        """
+        Records from start to stop, a chunk at a time.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        number = int(numpy.searchsorted(self.starts, start, side="right")) - 1
+        last = int(numpy.searchsorted(self.starts, stop - 1, side="right")) - 1
+        boundaries = (number, last)
+        while start < stop:
+            first = int(self.starts[number])
+            # only the boundary chunks are cached, lower_bound() has usually decompressed them already
+            records = self.chunk(number, number in boundaries)
+            end = min(stop, first + len(records))
+            yield records[start - first:end - first]
+            start = end
+            number += 1
+
+    def read(self, start: int = 0, stop: int|None = None) -> numpy.ndarray:
+        parts = list(self.iter_records(start, stop))
+        if not parts:
+            return numpy.empty(0, dtype=Bar.DTYPE)
+        return parts[0] if len(parts) == 1 else numpy.concatenate(parts)
@@ -1,104 +1,566 @@
-from datetime import datetime
-from enum import Enum
-import os
-import typing
-
-from collect.engine import BaseReader, BaseWriter
-from collect.bar.data import Bar
-
-
-class BarFrequency(Enum):
-    MIN_1 = "MIN_1"
-    DAY_1 = "DAY_1"
-
-
-class BarReader(BaseReader):
-    symbol: str
-
-    def __init__(self, namespace: str, symbol: str):
-        super().__init__(namespace)
-        self.symbol = symbol
-
-    def _get_years(self, freq: BarFrequency) -> typing.List[int]:
-        dir = self._bars_dir(freq)
-        if not os.path.isdir(dir):
-            return []
-        return [int(name[:-4]) for name in os.listdir(dir)]
-
-    def _bars_dir(self, freq: BarFrequency, year: int) -> str:
-        return os.path.join("data", "bars", self.namespace, self.symbol, freq.value)
-
-    def _bars_path(self, freq: BarFrequency, year: int) -> str:
-        return os.path.join("data", "bars", self.namespace, self.symbol, freq.value, f"{year}.bar")
-
-    def date_range(self, freq: BarFrequency) -> typing.Tuple[datetime, datetime]:
-        years = self._get_years(freq)
-        first_year = min(years)
-        last_year = max(years)
-        path = self._bars_path(freq, first_year)
-        with open(path, "rb") as fh:
-            fh.seek(4, os.SEEK_SET)
-            first_bar = Bar.read(fh)
-        path = self._bars_path(freq, last_year)
-        with open(path, "rb") as fh:
-            fh.seek(-Bar.BINARY_SIZE, os.SEEK_END)
-            last_bar = Bar.read(fh)
-        return (first_bar.date, last_bar.date)
-
-    def count(self, freq: BarFrequency):
-        count = 0
-        years = self._get_years(freq)
-        for year in years:
-            path = self._bars_path(freq, year)
-            count += (os.path.getsize(path) - 4) // Bar.BINARY_SIZE
-        return count
-
-    def read_all(self, freq: BarFrequency):
-        result = []
-        years = self._get_years(freq)
-        for year in years:
-            path = self._bars_path(freq, year)
-            count = (os.path.getsize(path) - 4) // Bar.BINARY_SIZE
-            with open(path, "rb") as fh:
-                fh.seek(4, os.SEEK_SET)
-                result.extend(Bar.read(fh) for _ in range(count))
-        return result
-
-    def read_since(self, freq: BarFrequency, start: datetime):
-        years = self._get_years(freq)
-        years = [year for year in years if year >= start.year]
-        result = []
-        for year in years:
-            path = self._bars_path(freq, year)
-            count = (os.path.getsize(path) - 4) // Bar.BINARY_SIZE
-            with open(path, "rb") as fh:
-                fh.seek(4, os.SEEK_SET)
-                bars = [Bar.read(fh) for _ in range(count)]
-                bars = [bar for bar in bars if bar.date >= start]
-                result.extend(bars)
-        return result
-
-
-class BarWriter(BaseWriter):
-    symbol: str
-
-    def __init__(self, collector, namespace, symbol: str):
-        super().__init__(collector, namespace)
-        self.symbol = symbol
-
-    def store(self, freq: BarFrequency, bars: typing.List[Bar]):
-        if not bars:
-            return
-        path = self.get_ns_data_path(self.symbol, freq.value + ".bar")
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        exists = os.path.isfile(path)
-        with open(path, "ab") as fh:
-            if not exists:
-                fh.write(Bar.MARKER.encode("ascii"))
-            else:
-                existing_marker = fh.read(4).decode("ascii")
-                if existing_marker != Bar.MARKER:
-                    raise Exception(f"Existing marker {existing_marker} does not match {Bar.MARKER}")
-                fh.seek(0, os.SEEK_END)
-            for bar in bars:
-                bar.write(fh)
+from datetime import datetime
+from enum import Enum
+import atexit
+import json
+import os
+import struct
+import threading
+import time
+import typing
+
+import numpy
+
+from collect.engine import BaseReader, BaseWriter
+from collect.bar.data import Bar, BarRecords, ChunkedBarFile, read_marker
+
+
+class BarFrequency(Enum):
+    MIN_1 = "MIN_1"
+    DAY_1 = "DAY_1"
+
+
+BARS_ROOT = os.path.join("data", "bars")
+
+
+def bars_dir(namespace: str, symbol: str, freq: BarFrequency) -> str:
+    return os.path.join(BARS_ROOT, namespace, symbol, freq.value)
+
+
+def bars_path(namespace: str, symbol: str, freq: BarFrequency, year: int) -> str:
+    """
+    Bars are partitioned into a file per UTC year.
+    """
+    return os.path.join(bars_dir(namespace, symbol, freq), f"{year}.bar")
+
+
+def list_years(namespace: str, symbol: str, freq: BarFrequency) -> typing.List[int]:
+    dir = bars_dir(namespace, symbol, freq)
+    if not os.path.isdir(dir):
+        return []
+    return sorted(int(name[:-4]) for name in os.listdir(dir) if name.endswith(".bar"))
+
+
+class BarReader(BaseReader):
+    RANGE_CHUNK_SIZE = 4096
+
+    symbol: str
+    catalog: "BarCatalog|None"
+
+    def __init__(self, collector, namespace: str, symbol: str, catalog: "BarCatalog|None" = None):
+        super().__init__(collector, namespace)
+        self.symbol = symbol
+        self.catalog = BAR_CATALOG if catalog is None else catalog
+
+    def _get_years(self, freq: BarFrequency) -> typing.List[int]:
+        return list_years(self.namespace, self.symbol, freq)
+
+    def _bars_dir(self, freq: BarFrequency) -> str:
+        return bars_dir(self.namespace, self.symbol, freq)
+
+    def _bars_path(self, freq: BarFrequency, year: int) -> str:
+        return bars_path(self.namespace, self.symbol, freq, year)
+
+    def paths(self, freq: BarFrequency) -> typing.List[str]:
+        return [self._bars_path(freq, year) for year in self._get_years(freq)]
+
+    @staticmethod
+    def _open_chunked(path: str) -> ChunkedBarFile|None:
+        """
+        The BAR9 file at the path, or None for a BAR8 file.
+        """
+        return ChunkedBarFile(path) if read_marker(path) == ChunkedBarFile.MARKER else None
+
+    def date_range(self, freq: BarFrequency) -> typing.Tuple[datetime, datetime]:
+        series = self.catalog.current_series(self.namespace, self.symbol, freq)
+        if series is not None and series["count"]:
+            return (datetime.fromtimestamp(series["first"]), datetime.fromtimestamp(series["last"]))
+        years = self._get_years(freq)
+        first_year = min(years)
+        last_year = max(years)
+        path = self._bars_path(freq, first_year)
+        chunked = self._open_chunked(path)
+        if chunked is not None:
+            first_date = datetime.fromtimestamp(chunked.first_timestamp)
+        else:
+            with open(path, "rb") as fh:
+                fh.seek(4, os.SEEK_SET)
+                first_date = Bar.read(fh).date
+        path = self._bars_path(freq, last_year)
+        chunked = self._open_chunked(path)
+        if chunked is not None:
+            last_date = datetime.fromtimestamp(chunked.last_timestamp)
+        else:
+            with open(path, "rb") as fh:
+                fh.seek(-Bar.BINARY_SIZE, os.SEEK_END)
+                last_date = Bar.read(fh).date
+        return (first_date, last_date)
+
+    def count(self, freq: BarFrequency):
+        series = self.catalog.current_series(self.namespace, self.symbol, freq)
+        if series is not None:
+            return series["count"]
+        count = 0
+        years = self._get_years(freq)
+        for year in years:
+            path = self._bars_path(freq, year)
+            chunked = self._open_chunked(path)
+            if chunked is not None:
+                count += len(chunked)
+            else:
+                count += (os.path.getsize(path) - 4) // Bar.BINARY_SIZE
+        return count
+
+    def read_all(self, freq: BarFrequency, objects: bool = False) -> BarRecords|typing.List[Bar]:
+        """
+        Reads every bar as BarRecords, or as Bar objects if asked for.
+        """
+        return self.read_range(freq, None, None, objects)
+
+    def read_since(self, freq: BarFrequency, start: datetime, objects: bool = False) -> BarRecords|typing.List[Bar]:
+        return self.read_range(freq, start, None, objects)
+
+    @staticmethod
+    def _read_timestamp(fh, index: int) -> int:
+        fh.seek(len(Bar.MARKER) + index * Bar.BINARY_SIZE, os.SEEK_SET)
+        return struct.unpack("<Q", fh.read(8))[0]
+
+    @classmethod
+    def _lower_bound(cls, fh, count: int, timestamp: float) -> int:
+        """
+        Index of the first record at or after the timestamp (in epoch seconds),
+        by binary search over the fixed-size records, reading only their timestamps.
+        """
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if cls._read_timestamp(fh, mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _range_slices(self, freq: BarFrequency, start: datetime|None, end: datetime|None) -> typing.Iterator[typing.Tuple[str, ChunkedBarFile|None, int, int]]:
+        """
+        The files overlapping the range with the record numbers of the range in them.
+        BAR9 files come opened, BAR8 ones as None.
+        """
+        start_timestamp = None if start is None else start.timestamp()
+        end_timestamp = None if end is None else end.timestamp()
+        for year in self._get_years(freq):
+            path = self._bars_path(freq, year)
+            chunked = self._open_chunked(path)
+            if chunked is not None:
+                # the chunk index has the first and last timestamps, only boundary chunks are decompressed
+                if len(chunked) == 0:
+                    continue
+                if start_timestamp is not None and chunked.last_timestamp < start_timestamp:
+                    continue
+                if end_timestamp is not None and chunked.first_timestamp >= end_timestamp:
+                    break
+                first = 0 if start_timestamp is None else chunked.lower_bound(start_timestamp)
+                stop = len(chunked) if end_timestamp is None else chunked.lower_bound(end_timestamp)
+                if first < stop:
+                    yield path, chunked, first, stop
+                continue
+            count = (os.path.getsize(path) - len(Bar.MARKER)) // Bar.BINARY_SIZE
+            if count <= 0:
+                continue
+            with open(path, "rb") as fh:
+                # whole files outside the range are skipped by their first and last record
+                if start_timestamp is not None and self._read_timestamp(fh, count - 1) < start_timestamp:
+                    continue
+                if end_timestamp is not None and self._read_timestamp(fh, 0) >= end_timestamp:
+                    break
+                first = 0 if start_timestamp is None else self._lower_bound(fh, count, start_timestamp)
+                stop = count if end_timestamp is None else self._lower_bound(fh, count, end_timestamp)
+            if first < stop:
+                yield path, None, first, stop
+
+    def iter_range(self, freq: BarFrequency, start: datetime|None, end: datetime|None) -> typing.Iterator[Bar]:
+        """
+        Streams the bars from start (inclusive) to end (exclusive), either bound may be None.
+        Only the records in the range are read, RANGE_CHUNK_SIZE at a time.
+        """
+        for records in self.iter_range_records(freq, start, end):
+            yield from records.to_bars()
+
+    def iter_range_records(self, freq: BarFrequency, start: datetime|None, end: datetime|None) -> typing.Iterator[BarRecords]:
+        """
+        Streams the records from start (inclusive) to end (exclusive) in chunks of RANGE_CHUNK_SIZE,
+        or a compressed chunk at a time for BAR9 files.
+        """
+        for path, chunked, first, stop in self._range_slices(freq, start, end):
+            if chunked is not None:
+                for records in chunked.iter_records(first, stop):
+                    yield BarRecords(records)
+                continue
+            with open(path, "rb") as fh:
+                fh.seek(len(Bar.MARKER) + first * Bar.BINARY_SIZE, os.SEEK_SET)
+                while first < stop:
+                    count = min(self.RANGE_CHUNK_SIZE, stop - first)
+                    yield BarRecords.from_buffer(fh.read(count * Bar.BINARY_SIZE))
+                    first += count
+
+    def read_range(self, freq: BarFrequency, start: datetime|None, end: datetime|None, objects: bool = False) -> BarRecords|typing.List[Bar]:
+        """
+        Reads the bars from start (inclusive) to end (exclusive), either bound may be None.
+        The records are memory-mapped and decoded in bulk,
+        Bar objects are only built if asked for.
+        """
+        parts = [
+            BarRecords(chunked.read(first, stop)) if chunked is not None else BarRecords.from_file(path, first, stop)
+            for path, chunked, first, stop in self._range_slices(freq, start, end)
+        ]
+        records = BarRecords.concatenate(parts)
+        return records.to_bars() if objects else records
+
+
+class BarWriter(BaseWriter):
+    symbol: str
+    compressed: bool
+    catalog: "BarCatalog"
+
+    def __init__(self, collector, namespace, symbol: str, compressed: bool = False, catalog: "BarCatalog|None" = None):
+        super().__init__(collector, namespace)
+        self.symbol = symbol
+        self.compressed = compressed
+        self.catalog = BAR_CATALOG if catalog is None else catalog
+        # the catalog is written once per collector run, not per store
+        if collector is not None and self.catalog.flush not in collector.on_run_done.observers:
+            collector.on_run_done.subscribe(self.catalog.flush)
+
+    @staticmethod
+    def encode(bars: typing.List[Bar]) -> numpy.ndarray:
+        """
+        Encodes bars into BAR8 records in one step.
+        """
+        return numpy.array(
+            [(int(bar.date.timestamp()), bar.iopen, bar.ihigh, bar.ilow, bar.iclose, bar.volume) for bar in bars],
+            dtype=Bar.DTYPE,
+        )
+
+    def _tail_timestamp(self, path: str) -> int|None:
+        """
+        Returns the timestamp of the last record of a file, reading only that record.
+        A partially written last record, or an interrupted BAR9 append, is cut off first.
+        """
+        if read_marker(path) == ChunkedBarFile.MARKER:
+            ChunkedBarFile.recover(path)
+            return ChunkedBarFile(path).last_timestamp
+        size = os.path.getsize(path)
+        with open(path, "r+b") as fh:
+            marker = fh.read(len(Bar.MARKER)).decode("ascii")
+            if marker != Bar.MARKER:
+                raise Exception(f"Existing marker {marker} does not match {Bar.MARKER}")
+            count = (size - len(Bar.MARKER)) // Bar.BINARY_SIZE
+            whole = len(Bar.MARKER) + count * Bar.BINARY_SIZE
+            if whole != size:
+                fh.truncate(whole)
+            if count == 0:
+                return None
+            fh.seek(whole - Bar.BINARY_SIZE, os.SEEK_SET)
+            return struct.unpack("<Q", fh.read(8))[0]
+
+    def last_timestamp(self, freq: BarFrequency) -> int|None:
+        """
+        Epoch seconds of the newest stored bar.
+        """
+        for year in reversed(list_years(self.namespace, self.symbol, freq)):
+            timestamp = self._tail_timestamp(bars_path(self.namespace, self.symbol, freq, year))
+            if timestamp is not None:
+                return timestamp
+        return None
+
+    def store(self, freq: BarFrequency, bars: typing.List[Bar]|BarRecords) -> int:
+        """
+        Appends the bars that are newer than the stored ones, in timestamp order,
+        each to the file of its year, with a single write per file.
+        Files keep their format, new files are BAR9 if the writer is compressed.
+        The catalog is updated with the years written.
+        Returns the number of bars appended.
+        """
+        records = bars.records if isinstance(bars, BarRecords) else self.encode(list(bars))
+        if len(records) == 0:
+            return 0
+        # sorted, one bar per timestamp
+        _, first = numpy.unique(records["timestamp"], return_index=True)
+        records = records[first]
+        last = self.last_timestamp(freq)
+        if last is not None:
+            records = records[records["timestamp"] > last]
+        if len(records) == 0:
+            return 0
+        years = records["timestamp"].astype("datetime64[s]").astype("datetime64[Y]").astype(numpy.int64) + 1970
+        bounds = numpy.flatnonzero(numpy.diff(years)) + 1
+        starts = numpy.concatenate(([0], bounds))
+        for start, part in zip(starts, numpy.split(records, bounds)):
+            self._store_year(freq, int(years[start]), part)
+        self.catalog.update(self.namespace, self.symbol, freq, [int(years[start]) for start in starts])
+        return len(records)
+
+    def _store_year(self, freq: BarFrequency, year: int, records: numpy.ndarray):
+        path = bars_path(self.namespace, self.symbol, freq, year)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        exists = os.path.isfile(path)
+        if exists and read_marker(path) == ChunkedBarFile.MARKER:
+            ChunkedBarFile.recover(path)
+            ChunkedBarFile(path).append(records)
+            return
+        if not exists and self.compressed:
+            ChunkedBarFile.write(path, records)
+            return
+        with open(path, "ab") as fh:
+            if not exists:
+                fh.write(Bar.MARKER.encode("ascii"))
+            fh.write(records.tobytes())
+
+    def compress(self, freq: BarFrequency, year: int) -> bool:
+        """
+        Rewrites the BAR8 file of a year as BAR9, meant for years that are complete.
+        The file is replaced atomically.
+        """
+        path = bars_path(self.namespace, self.symbol, freq, year)
+        if not os.path.isfile(path) or read_marker(path) != Bar.MARKER:
+            return False
+        # copied out of the memory map, so the file can be replaced
+        records = numpy.array(BarRecords.from_file(path).records)
+        ChunkedBarFile.write(path, records)
+        self.catalog.update(self.namespace, self.symbol, freq, [year])
+        return True
+
+
+class BarCatalog:
+    """
+    Per series first and last timestamp, count, size and formats of the stored bars, in one JSON file.
+    Updates are kept in memory until flush(), which merges them into the file under a lock file shared by all processes.
+    """
+    PATH = os.path.join(BARS_ROOT, "catalog.json")
+    # a lock file older than this is left over from a crashed writer, flushes take milliseconds
+    LOCK_TIMEOUT = 30.0
+    LOCK_POLL = 0.01
+
+    path: str
+    lock: threading.Lock
+    entries: typing.Dict[str, typing.Dict[str, typing.Any]]
+    pending: typing.Dict[str, typing.Dict[str, typing.Any]]
+    version: int|None
+    indexed: bool
+    rows: typing.List[typing.Dict[str, typing.Any]]
+    freqs: numpy.ndarray
+    firsts: numpy.ndarray
+    lasts: numpy.ndarray
+
+    def __init__(self, path: str = PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.pending = {}
+        self.version = None
+        self.indexed = False
+
+    @staticmethod
+    def key(namespace: str, symbol: str, freq: BarFrequency) -> str:
+        return f"{namespace}/{symbol}/{freq.value}"
+
+    def _load(self):
+        try:
+            version = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            version = None
+        if version == self.version:
+            return
+        entries = {}
+        if version is not None:
+            with open(self.path, "rt", encoding="utf-8") as fh:
+                entries = json.load(fh)
+        self.entries = entries
+        self.version = version
+        self.indexed = False
+
+    def _get(self, key: str) -> typing.Dict[str, typing.Any]|None:
+        # unflushed updates of this process come first
+        entry = self.pending.get(key)
+        return entry if entry is not None else self.entries.get(key)
+
+    def _rows(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        if not self.pending:
+            return list(self.entries.values())
+        return list({**self.entries, **self.pending}.values())
+
+    def _index(self):
+        """
+        Columns of the series for vectorized queries, series without bars never match.
+        Rebuilt on the first query after a change.
+        """
+        if self.indexed:
+            return
+        self.rows = self._rows()
+        self.freqs = numpy.array([entry["freq"] for entry in self.rows], dtype=object)
+        self.firsts = numpy.array([entry["first"] if entry["count"] else numpy.iinfo(numpy.int64).max for entry in self.rows], dtype=numpy.int64)
+        self.lasts = numpy.array([entry["last"] if entry["count"] else -1 for entry in self.rows], dtype=numpy.int64)
+        self.indexed = True
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        # unique per writer, concurrent flushes never share a temporary file
+        temporary = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "wt", encoding="utf-8") as fh:
+            json.dump(self.entries, fh, sort_keys=True)
+        os.replace(temporary, self.path)
+        self.version = os.stat(self.path).st_mtime_ns
+        self.indexed = False
+
+    def _acquire_file_lock(self) -> str:
+        """
+        Takes the lock file shared by all processes, creating it fails while another one holds it.
+        """
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        path = self.path + ".lock"
+        while True:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return path
+            except FileExistsError:
+                pass
+            try:
+                if time.time() - os.path.getmtime(path) > self.LOCK_TIMEOUT:
+                    os.remove(path)
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(self.LOCK_POLL)
+
+    @staticmethod
+    def file_stats(path: str) -> typing.Dict[str, typing.Any]:
+        stat = os.stat(path)
+        size = stat.st_size
+        marker = read_marker(path)
+        if marker == ChunkedBarFile.MARKER:
+            chunked = ChunkedBarFile(path)
+            return {"format": marker, "first": chunked.first_timestamp, "last": chunked.last_timestamp, "count": len(chunked), "bytes": size, "mtime": stat.st_mtime_ns}
+        count = max(0, (size - len(Bar.MARKER)) // Bar.BINARY_SIZE)
+        first = last = None
+        if count:
+            with open(path, "rb") as fh:
+                first = BarReader._read_timestamp(fh, 0)
+                last = BarReader._read_timestamp(fh, count - 1)
+        return {"format": marker, "first": first, "last": last, "count": count, "bytes": size, "mtime": stat.st_mtime_ns}
+
+    def _build_entry(self, namespace: str, symbol: str, freq: BarFrequency, years: typing.List[int]|None) -> typing.Dict[str, typing.Any]:
+        entry = self._get(self.key(namespace, symbol, freq))
+        if entry is None or years is None:
+            entry = {"namespace": namespace, "symbol": symbol, "freq": freq.value, "years": {}}
+            years = list_years(namespace, symbol, freq)
+        else:
+            entry = {**entry, "years": dict(entry["years"])}
+        for year in years:
+            path = bars_path(namespace, symbol, freq, year)
+            if os.path.isfile(path):
+                entry["years"][str(year)] = self.file_stats(path)
+            else:
+                entry["years"].pop(str(year), None)
+        files = [entry["years"][year] for year in sorted(entry["years"])]
+        filled = [stats for stats in files if stats["count"]]
+        entry["first"] = filled[0]["first"] if filled else None
+        entry["last"] = filled[-1]["last"] if filled else None
+        entry["count"] = sum(stats["count"] for stats in files)
+        entry["bytes"] = sum(stats["bytes"] for stats in files)
+        entry["formats"] = sorted({stats["format"] for stats in files})
+        return entry
+
+    def update(self, namespace: str, symbol: str, freq: BarFrequency, years: typing.List[int]|None = None):
+        """
+        Refreshes the series from the files of the given years, or from all of its files.
+        The change is written by the next flush().
+        """
+        with self.lock:
+            self._load()
+            self.pending[self.key(namespace, symbol, freq)] = self._build_entry(namespace, symbol, freq, years)
+            self.indexed = False
+
+    def flush(self, *_):
+        """
+        Writes the updated series into the catalog file, keeping the series other processes wrote.
+        Takes any arguments, so it can observe collector signals.
+        """
+        with self.lock:
+            if not self.pending:
+                return
+            lock_path = self._acquire_file_lock()
+            try:
+                # another process may have written within the same mtime tick
+                self.version = None
+                self._load()
+                self.entries = {**self.entries, **self.pending}
+                self.pending = {}
+                self._save()
+            finally:
+                os.remove(lock_path)
+
+    def rebuild(self):
+        """
+        Scans the whole store, for data written before the catalog or by other means.
+        """
+        with self.lock:
+            lock_path = self._acquire_file_lock()
+            try:
+                self.entries = {}
+                self.pending = {}
+                entries = {}
+                for namespace in sorted(os.listdir(BARS_ROOT)) if os.path.isdir(BARS_ROOT) else []:
+                    if not os.path.isdir(os.path.join(BARS_ROOT, namespace)):
+                        continue
+                    for symbol in sorted(os.listdir(os.path.join(BARS_ROOT, namespace))):
+                        for freq in BarFrequency:
+                            if os.path.isdir(bars_dir(namespace, symbol, freq)):
+                                entries[self.key(namespace, symbol, freq)] = self._build_entry(namespace, symbol, freq, None)
+                self.entries = entries
+                self._save()
+            finally:
+                os.remove(lock_path)
+
+    def series(self, namespace: str, symbol: str, freq: BarFrequency) -> typing.Dict[str, typing.Any]|None:
+        self._load()
+        return self._get(self.key(namespace, symbol, freq))
+
+    def current_series(self, namespace: str, symbol: str, freq: BarFrequency) -> typing.Dict[str, typing.Any]|None:
+        """
+        The series if it still matches its files, None if they were written since,
+        such as by another process that has not flushed yet.
+        """
+        series = self.series(namespace, symbol, freq)
+        if series is None or list(map(int, sorted(series["years"]))) != list_years(namespace, symbol, freq):
+            return None
+        for year, stats in series["years"].items():
+            try:
+                stat = os.stat(bars_path(namespace, symbol, freq, int(year)))
+            except FileNotFoundError:
+                return None
+            if stat.st_size != stats["bytes"] or stat.st_mtime_ns != stats.get("mtime"):
+                return None
+        return series
+
+    def all_series(self) -> typing.List[typing.Dict[str, typing.Any]]:
+        self._load()
+        return self._rows()
+
+    def covering(self, freq: BarFrequency, start: datetime|None = None, end: datetime|None = None, namespace: str|None = None) -> typing.List[typing.Dict[str, typing.Any]]:
+        """
+        The series of a frequency with bars at or before start and at or after end.
+        """
+        self._load()
+        self._index()
+        mask = self.freqs == freq.value
+        if start is not None:
+            mask &= self.firsts <= start.timestamp()
+        if end is not None:
+            mask &= self.lasts >= end.timestamp()
+        result = [self.rows[index] for index in numpy.flatnonzero(mask)]
+        if namespace is not None:
+            result = [entry for entry in result if entry["namespace"] == namespace]
+        return result
+
+
+BAR_CATALOG = BarCatalog()
+# updates of a run that ended without a flush, such as a single run_once()
+atexit.register(BAR_CATALOG.flush)
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import shutil
+import typing
+
+import numpy
+
+from engine.bar.event import BarBatch
+
+CACHE_COLUMNS = ("timestamps", "open", "high", "low", "close", "volume")
+
+
+def _function_signature(function: typing.Callable|None) -> str:
+    if function is None:
+        return ""
+    name = f"{getattr(function, '__module__', '')}.{getattr(function, '__qualname__', repr(function))}"
+    code = getattr(function, "__code__", None)
+    if code is not None:
+        # lambdas all share a name, their code tells them apart
+        name += ":" + hashlib.sha1(code.co_code + repr(code.co_consts).encode("utf-8")).hexdigest()[:12]
+    return name
+
+
+class ColumnCache:
+    """
+    Decoded CSV columns, stored as .npy files in a .cache directory next to the source file.
+    Entries are keyed by the source path, modification time and size and by the column mapping,
+    so an edited file or a different mapping never reads a stale entry.
+    Fresh entries are memory-mapped instead of read.
+    Each cache directory is kept under max_bytes by evicting the least recently used entries.
+    """
+    DIRECTORY = ".cache"
+    MAX_BYTES = 1 << 30
+
+    max_bytes: int
+
+    def __init__(self, max_bytes: int = MAX_BYTES):
+        self.max_bytes = max_bytes
+
+    def _directory(self, path: str) -> str:
+        return os.path.join(os.path.dirname(os.path.abspath(path)), self.DIRECTORY)
+
+    def _entry(self, path: str, mapping: typing.List[typing.Any]) -> str:
+        stat = os.stat(path)
+        key = [os.path.abspath(path), str(stat.st_mtime_ns), str(stat.st_size)]
+        for col in mapping:
+            key.append(f"{col.column}>{col.field}>{_function_signature(col.parse)}>{_function_signature(col.parse_column)}")
+        digest = hashlib.sha1("\n".join(key).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self._directory(path), f"{os.path.basename(path)}.{digest}")
+
+    def load(self, path: str, mapping: typing.List[typing.Any]) -> BarBatch|None:
+        """
+        Returns the cached columns of the file, or None if there is no fresh entry.
+        """
+        entry = self._entry(path, mapping)
+        if not os.path.isdir(entry):
+            return None
+        try:
+            columns = [numpy.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r") for name in CACHE_COLUMNS]
+        except (OSError, ValueError):
+            return None
+        # the modification time of an entry is its last use
+        os.utime(entry)
+        return BarBatch(*columns)
+
+    def store(self, path: str, mapping: typing.List[typing.Any], batch: BarBatch):
+        entry = self._entry(path, mapping)
+        temporary = f"{entry}.{os.getpid()}.tmp"
+        os.makedirs(temporary, exist_ok=True)
+        try:
+            for name in CACHE_COLUMNS:
+                numpy.save(os.path.join(temporary, f"{name}.npy"), getattr(batch, name))
+            # the entry only appears once it is complete
+            os.replace(temporary, entry)
+        except OSError:
+            # another process has stored the same entry meanwhile
+            shutil.rmtree(temporary, ignore_errors=True)
+            return
+        self.evict(self._directory(path))
+
+    def evict(self, directory: str):
+        entries = []
+        for name in os.listdir(directory):
+            entry = os.path.join(directory, name)
+            if name.endswith(".tmp") or not os.path.isdir(entry):
+                continue
+            size = sum(file.stat().st_size for file in os.scandir(entry))
+            entries.append((os.stat(entry).st_mtime, size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+
+COLUMN_CACHE = ColumnCache()
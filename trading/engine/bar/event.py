@@ -1,19 +1,162 @@
-import datetime
-
-from engine.feed import Event
-
-
-class BarEvent(Event):
-    open: float
-    high: float
-    low: float
-    close: float
-    volume: float
-
-    def __init__(self, timestamp: datetime.datetime, open: float, high: float, low: float, close: float, volume: float):
-        super().__init__(timestamp)
-        self.open = open
-        self.high = high
-        self.low = low
-        self.close = close
-        self.volume = volume
+import datetime
+import typing
+
+import numpy
+
+from engine.feed import Event, EventBatch
+
+
+class BarEvent(Event):
+    __slots__ = ("open", "high", "low", "close", "volume", "indicators")
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    indicators: typing.Dict[str, float]|None
+
+    def __init__(self, timestamp: datetime.datetime|int, open: float, high: float, low: float, close: float, volume: float):
+        super().__init__(timestamp)
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.indicators = None
+
+
+class BarBatch(EventBatch):
+    __slots__ = ("timestamps", "open", "high", "low", "close", "volume", "indicators")
+    timestamps: numpy.ndarray
+    open: numpy.ndarray
+    high: numpy.ndarray
+    low: numpy.ndarray
+    close: numpy.ndarray
+    volume: numpy.ndarray
+    indicators: typing.Dict[str, numpy.ndarray]|None
+
+    def __init__(self, timestamps: numpy.ndarray, open: numpy.ndarray, high: numpy.ndarray, low: numpy.ndarray, close: numpy.ndarray, volume: numpy.ndarray, indicators: typing.Dict[str, numpy.ndarray]|None = None):
+        """
+        Timestamps are int64 epoch nanoseconds, the other columns are float64.
+        All columns have the same length, which must not be zero.
+        Indicator values, if any, are columns of the same length.
+        """
+        super().__init__(int(timestamps[0]))
+        self.timestamps = timestamps
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.indicators = indicators
+
+    @classmethod
+    def from_bars(cls, bars: typing.List[BarEvent]) -> "BarBatch":
+        return BarBatch(
+            timestamps=numpy.array([bar.ns for bar in bars], dtype=numpy.int64),
+            open=numpy.array([bar.open for bar in bars], dtype=numpy.float64),
+            high=numpy.array([bar.high for bar in bars], dtype=numpy.float64),
+            low=numpy.array([bar.low for bar in bars], dtype=numpy.float64),
+            close=numpy.array([bar.close for bar in bars], dtype=numpy.float64),
+            volume=numpy.array([bar.volume for bar in bars], dtype=numpy.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index: slice) -> "BarBatch":
+        return BarBatch(
+            timestamps=self.timestamps[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+            indicators={name: values[index] for name, values in self.indicators.items()} if self.indicators is not None else None,
+        )
+
+    def bar(self, index: int) -> BarEvent:
+        result = BarEvent(
+            timestamp=int(self.timestamps[index]),
+            open=float(self.open[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            close=float(self.close[index]),
+            volume=float(self.volume[index]),
+        )
+        if self.indicators is not None:
+            result.indicators = {name: float(values[index]) for name, values in self.indicators.items()}
+        result.feed = self.feed
+        return result
+
+    def __iter__(self) -> typing.Iterator[BarEvent]:
+        for index in range(len(self.timestamps)):
+            yield self.bar(index)
+
+    @property
+    def last_ns(self) -> int:
+        return int(self.timestamps[-1])
+
+    @classmethod
+    def merge(cls, parts: typing.List["BarBatch"]) -> "MergedBarBatch|None":
+        if cls is not BarBatch:
+            return None
+        # indicators are only carried over when every part has the same ones
+        names = None if parts[0].indicators is None else set(parts[0].indicators)
+        for part in parts:
+            if (None if part.indicators is None else set(part.indicators)) != names:
+                return None
+        timestamps = numpy.concatenate([part.timestamps for part in parts])
+        order = numpy.argsort(timestamps, kind="stable")
+        feeds = numpy.empty(len(parts), dtype=object)
+        feeds[:] = [part.feed for part in parts]
+        return MergedBarBatch(
+            timestamps=timestamps[order],
+            feeds=numpy.repeat(feeds, [len(part) for part in parts])[order],
+            open=numpy.concatenate([part.open for part in parts])[order],
+            high=numpy.concatenate([part.high for part in parts])[order],
+            low=numpy.concatenate([part.low for part in parts])[order],
+            close=numpy.concatenate([part.close for part in parts])[order],
+            volume=numpy.concatenate([part.volume for part in parts])[order],
+            indicators={name: numpy.concatenate([part.indicators[name] for part in parts])[order] for name in names} if names is not None else None,
+        )
+
+    def split(self, ns: int, inclusive: bool) -> typing.Tuple["BarBatch|None", "BarBatch|None"]:
+        side = "right" if inclusive else "left"
+        count = int(numpy.searchsorted(self.timestamps, ns, side=side))
+        head = self[:count] if count > 0 else None
+        tail = self[count:] if count < len(self.timestamps) else None
+        for part in (head, tail):
+            if part is not None:
+                part.feed = self.feed
+        return head, tail
+
+
+class MergedBarBatch(BarBatch):
+    """
+    Bars of several feeds in timestamp order, as merged by the EventAggregator.
+    The batch itself has no feed, every bar has its own in feeds.
+    """
+    __slots__ = ("feeds",)
+    feeds: numpy.ndarray
+
+    def __init__(self, timestamps: numpy.ndarray, feeds: numpy.ndarray, open: numpy.ndarray, high: numpy.ndarray, low: numpy.ndarray, close: numpy.ndarray, volume: numpy.ndarray, indicators: typing.Dict[str, numpy.ndarray]|None = None):
+        super().__init__(timestamps, open, high, low, close, volume, indicators)
+        self.feeds = feeds
+
+    def __getitem__(self, index: slice) -> "MergedBarBatch":
+        return MergedBarBatch(
+            timestamps=self.timestamps[index],
+            feeds=self.feeds[index],
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+            indicators={name: values[index] for name, values in self.indicators.items()} if self.indicators is not None else None,
+        )
+
+    def bar(self, index: int) -> BarEvent:
+        result = super().bar(index)
+        result.feed = self.feeds[index]
+        return result
@@ -1,40 +1,104 @@
-from datetime import datetime, timezone
-
-from engine.feed import EventFeed
-from engine.bar.event import BarEvent
-from engine.bar.history import BarHistory
-from engine.bar.live import BarLiveFeed
-
-
-class BarFeed(EventFeed[BarEvent]):
-    history: BarHistory|None = None
-    live_feed: BarLiveFeed|None = None
-
-    def start(self):
-        if self.history is not None:
-            self.history.start()
-
-    def _historical_next(self) -> BarEvent|None:
-        if self.history is not None:
-            return self.history.next()
-        
-    async def _live_next(self) -> BarEvent|None:
-        if self.live_feed is not None:
-            return await self.live_feed.next()
-
-    def _try_stop_history(self):
-        if self.history is None:
-            return
-        self.history.stop()
-        self.history = None
-
-    def start_live(self):
-        self._try_stop_history()
-        if self.live_feed is not None:
-            self.live_feed.start()
-            self.live_since = self.live_since - ((self.live_since - datetime.min.replace(tzinfo=timezone.utc)) % self.live_feed.interval)
-
-    def stop(self):
-        self._try_stop_history()
-        if self.live_feed is not None:
-            self.live_feed.stop()
+from datetime import datetime, timezone
+import typing
+
+from engine.feed import EventFeed
+from engine.bar.event import BarBatch, BarEvent
+from engine.bar.history import BarHistory
+from engine.bar.indicator import IndicatorSet
+from engine.bar.live import BarLiveFeed
+
+
+class BarFeed(EventFeed[BarEvent]):
+    """
+    Replays the history of a symbol and then follows its live bars.
+    With indicators set, their values are attached to every bar or batch emitted.
+    History is then read and evaluated a block at a time even when single bars are emitted,
+    live bars update the indicators one by one from where the history left them.
+    """
+    INDICATOR_BLOCK_SIZE = 4096
+
+    history: BarHistory|None = None
+    live_feed: BarLiveFeed|None = None
+    batch_size: int|None = None
+    indicators: IndicatorSet|None = None
+    block: BarBatch|None = None
+    block_index: int = 0
+
+    def start(self):
+        if self.history is not None:
+            self.history.start()
+
+    def seek(self, timestamp: datetime) -> bool:
+        if self.history is None:
+            return True
+        if self.indicators is not None and self.indicators.indicators:
+            # indicators warm up over the bars before the timestamp, the caller reads and skips them
+            return False
+        self.block = None
+        return self.history.seek(timestamp)
+
+    def position(self) -> typing.Any:
+        if self.history is None:
+            return None
+        history = self.history.position()
+        if history is None:
+            return None
+        # indicator state and the block being handed out belong to the position as well
+        return (history, self.indicators, self.block, self.block_index)
+
+    def restore(self, position: typing.Any) -> bool:
+        history, self.indicators, self.block, self.block_index = position
+        return self.history is not None and self.history.restore(history)
+
+    def _historical_next(self) -> BarEvent|BarBatch|None:
+        if self.history is not None:
+            if self.indicators is not None:
+                return self._historical_next_with_indicators()
+            if self.batch_size is not None:
+                return self.history.next_batch(self.batch_size)
+            return self.history.next()
+
+    def _historical_next_with_indicators(self) -> BarEvent|BarBatch|None:
+        if self.batch_size is not None:
+            batch = self.history.next_batch(self.batch_size)
+            if batch is not None:
+                self.indicators.compute(batch)
+            return batch
+        if self.block is None or self.block_index >= len(self.block):
+            self.block = self.history.next_batch(self.INDICATOR_BLOCK_SIZE)
+            self.block_index = 0
+            if self.block is None:
+                return None
+            self.indicators.compute(self.block)
+        bar = self.block.bar(self.block_index)
+        self.block_index += 1
+        return bar
+
+    async def _live_next(self) -> BarEvent|None:
+        if self.live_feed is not None:
+            bar = await self.live_feed.next()
+            if bar is not None and self.indicators is not None:
+                self.indicators.update(bar)
+            return bar
+
+    def _try_stop_history(self):
+        if self.history is None:
+            return
+        self.history.stop()
+        self.history = None
+        self.block = None
+
+    def start_live(self):
+        self._try_stop_history()
+        if self.live_feed is not None:
+            self.live_feed.start()
+            self.live_since = self.live_since - ((self.live_since - datetime.min.replace(tzinfo=timezone.utc)) % self.live_feed.interval)
+
+    def stop(self):
+        self._try_stop_history()
+        if self.live_feed is not None:
+            self.live_feed.stop()
+
+    async def aclose(self):
+        if self.live_feed is not None:
+            await self.live_feed.aclose()
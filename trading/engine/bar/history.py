@@ -1,108 +1,379 @@
-import csv
-import io
-import typing
-
-from engine.bar.event import BarEvent
-
-
-class BarHistory:
-    def start(self):
-        """
-        Starts the history reading.
-        Called once before the first call to next().
-        """
-        pass
-
-    def next(self) -> BarEvent|None:
-        raise NotImplementedError()
-    
-    def stop(self):
-        """
-        Stops the history reading.
-        Called once after the last call to next().
-        """
-        pass
-
-
-class CsvColumnMapping:
-    column: str
-    parse: typing.Callable[[str], typing.Any]
-    field: str
-
-    def __init__(self, column: str, parse: typing.Callable[[str], typing.Any], field: str):
-        self.column = column
-        self.parse = parse
-        self.field = field
-
-    def map(self, value: str, obj: BarEvent):
-        setattr(obj, self.field, self.parse(value))
-
-
-class CsvColumnMapper:
-    columns: typing.List[CsvColumnMapping]
-    col_indices: typing.Dict[str, int]
-
-    def __init__(self, columns: typing.List[CsvColumnMapping], header: typing.List[str]):
-        self.columns = columns
-        self.col_indices = {col.column: header.index(col.column) for col in columns}
-
-    def map(self, row: typing.List[str]):
-        result = BarEvent(None, None, None, None, None, None)
-        for col in self.columns:
-            value = row[self.col_indices[col.column]]
-            if not value or value == "null":
-                continue
-            col.map(value, result)
-        return result
-    
-    @classmethod
-    def try_make(self, columns: typing.List[CsvColumnMapping], header: typing.List[str]):
-        if all(col.column in header for col in columns):
-            return CsvColumnMapper(columns, header)
-
-
-class CsvBarHistory(BarHistory):
-    fh: io.IOBase
-    reader: typing.Iterable[BarEvent]
-    columns: typing.List[CsvColumnMapping]|None = None
-    mapper: CsvColumnMapper|None = None
-    read_header: bool = False
-
-    def __init__(self, path: str, columns: typing.List[CsvColumnMapping]|None = None):
-        self.fh = open(path)
-        self.reader = csv.reader(self.fh)
-        if columns is not None:
-            self.set_columns(columns)
-
-    def set_columns(self, columns: typing.List[CsvColumnMapping]):
-        self.columns = columns
-        self.read_header = True
-
-    def start(self):
-        if self.read_header:
-            header: typing.List[str] = next(self.reader)
-            mapper = CsvColumnMapper.try_make(self.columns, header)
-            if mapper is not None:
-                self.mapper = mapper
-
-    def transform(self, row: typing.List[float]):
-        if self.mapper is not None:
-            return self.mapper.map(row)
-        raise NotImplementedError()
-
-    def next(self) -> BarEvent:
-        if self.reader is None:
-            return
-        try:
-            row = next(self.reader)
-            bar = self.transform(row)
-            return bar
-        except StopIteration:
-            self.stop()
-
-    def stop(self):
-        if self.fh is None:
-            return
-        self.reader = None
-        self.fh.close()
-        self.fh = None
+import csv
+import datetime
+import os
+import time
+import typing
+
+import numpy
+
+from engine.bar.cache import ColumnCache
+from engine.bar.event import BarBatch, BarEvent
+from engine.feed import datetime_to_ns
+from engine.profiler import Profiler
+
+NULL_VALUES = ("", "null")
+CSV_SEEK_BLOCK = 1 << 16
+
+
+class BarHistory:
+    profiler: Profiler|None = None
+
+    def start(self):
+        """
+        Starts the history reading.
+        Called once before the first call to next().
+        """
+        pass
+
+    def next(self) -> BarEvent|None:
+        raise NotImplementedError()
+
+    def seek(self, timestamp: datetime.datetime) -> bool:
+        """
+        Skips to the first bar at or after the timestamp.
+        Called after start() and before the first call to next().
+        Returns False if seeking is not supported.
+        """
+        return False
+
+    def position(self) -> typing.Any:
+        """
+        Returns the read position as a picklable value, or None if it cannot be restored.
+        """
+        return None
+
+    def restore(self, position: typing.Any) -> bool:
+        """
+        Continues reading from a position returned by position().
+        Called after start() instead of seek().
+        """
+        return False
+
+    def next_batch(self, count: int) -> BarBatch|None:
+        """
+        Reads up to count bars at once.
+        Returns None once the history has ended.
+        """
+        bars = []
+        while len(bars) < count:
+            bar = self.next()
+            if bar is None:
+                break
+            bars.append(bar)
+        if bars:
+            return BarBatch.from_bars(bars)
+    
+    def stop(self):
+        """
+        Stops the history reading.
+        Called once after the last call to next().
+        """
+        pass
+
+
+class ArrayBarHistory(BarHistory):
+    """
+    Replays bars that are already available as columns.
+    Subclasses provide the bars by index, next() only walks the rows.
+    """
+    index: int = 0
+    count: int = 0
+
+    def _bar(self, index: int) -> BarEvent:
+        raise NotImplementedError()
+
+    def _slice(self, start: int, stop: int) -> BarBatch:
+        raise NotImplementedError()
+
+    def position(self) -> typing.Any:
+        return self.index
+
+    def restore(self, position: typing.Any) -> bool:
+        self.index = position
+        return True
+
+    def next(self) -> BarEvent|None:
+        if self.index >= self.count:
+            return None
+        bar = self._bar(self.index)
+        self.index += 1
+        return bar
+
+    def next_batch(self, count: int) -> BarBatch|None:
+        if self.index >= self.count:
+            return None
+        start = self.index
+        self.index = min(start + count, self.count)
+        return self._slice(start, self.index)
+
+
+class BatchBarHistory(ArrayBarHistory):
+    """
+    Replays a BarBatch held in memory.
+    """
+    data: BarBatch|None = None
+
+    def __init__(self, data: BarBatch|None):
+        self.data = data
+
+    def start(self):
+        self.index = 0
+        self.count = len(self.data) if self.data is not None else 0
+
+    def seek(self, timestamp: datetime.datetime) -> bool:
+        if self.data is not None:
+            self.index = int(numpy.searchsorted(self.data.timestamps, datetime_to_ns(timestamp)))
+        return True
+
+    def _bar(self, index: int) -> BarEvent:
+        return self.data.bar(index)
+
+    def _slice(self, start: int, stop: int) -> BarBatch:
+        return self.data[start:stop]
+
+
+def has_field_count(body: bytes, count: int) -> bool:
+    """
+    Whether every line of a CSV body without quotes has exactly count fields.
+    """
+    data = numpy.frombuffer(body, dtype=numpy.uint8)
+    breaks = numpy.flatnonzero(data == ord("\n"))
+    commas = numpy.flatnonzero(data == ord(","))
+    rows = len(breaks) + 1
+    if len(commas) != rows * (count - 1):
+        return False
+    # a short line followed by a long one has the right total, so the commas before every line break are counted
+    return bool((numpy.searchsorted(commas, breaks) == numpy.arange(1, rows) * (count - 1)).all())
+
+
+def read_csv_columns(path: str, offset: int|None = None) -> typing.Tuple[typing.List[str], typing.List[typing.Sequence[str]]]:
+    """
+    Reads a CSV file into its header and a list of raw string columns.
+    If an offset is given, rows are read starting at that byte offset.
+    """
+    with open(path, "rb") as fh:
+        header_line = fh.readline().decode("utf-8")
+        if offset is not None:
+            fh.seek(offset)
+        raw = fh.read()
+    body = raw.decode("utf-8")
+    header = next(csv.reader([header_line]), [])
+    if not header or not body:
+        return header, []
+    body = body.replace("\r\n", "\n").rstrip("\n")
+    if '"' not in body and "\n\n" not in body and has_field_count(raw.rstrip(b"\r\n"), len(header)):
+        # plain files are split in bulk, every field lands in one flat list
+        fields = body.replace("\n", ",").split(",")
+        return header, [fields[i::len(header)] for i in range(len(header))]
+    rows = list(csv.reader(body.split("\n")))
+    return header, [list(column) for column in zip(*rows)]
+
+
+def float_column(values: typing.Sequence[str]) -> numpy.ndarray:
+    column = numpy.array(values, dtype=object)
+    column[(column == "") | (column == "null")] = "nan"
+    return column.astype(numpy.float64)
+
+
+def date_column(values: typing.Sequence[str]) -> numpy.ndarray:
+    """
+    Parses ISO 8601 dates as UTC into int64 epoch nanoseconds.
+    """
+    column = numpy.array(values)
+    column = numpy.where((column == "") | (column == "null"), "NaT", column)
+    return column.astype("datetime64[ns]").astype(numpy.int64)
+
+
+class CsvColumnMapping:
+    column: str
+    parse: typing.Callable[[str], typing.Any]
+    field: str
+    parse_column: typing.Callable[[typing.Sequence[str]], numpy.ndarray]|None
+
+    def __init__(self, column: str, parse: typing.Callable[[str], typing.Any], field: str, parse_column: typing.Callable[[typing.Sequence[str]], numpy.ndarray]|None = None):
+        self.column = column
+        self.parse = parse
+        self.field = field
+        self.parse_column = parse_column
+
+    def map(self, value: str, obj: BarEvent):
+        setattr(obj, self.field, self.parse(value))
+
+    def map_column(self, values: typing.Sequence[str]) -> numpy.ndarray:
+        if self.parse_column is not None:
+            return self.parse_column(values)
+        parsed = [self.parse(value) if value not in NULL_VALUES else None for value in values]
+        if self.field == "timestamp":
+            return numpy.array([datetime_to_ns(value) for value in parsed], dtype=numpy.int64)
+        return numpy.array(parsed, dtype=numpy.float64)
+
+
+class CsvColumnMapper:
+    columns: typing.List[CsvColumnMapping]
+    col_indices: typing.Dict[str, int]
+
+    def __init__(self, columns: typing.List[CsvColumnMapping], header: typing.List[str]):
+        self.columns = columns
+        self.col_indices = {col.column: header.index(col.column) for col in columns}
+
+    def map(self, row: typing.List[str]):
+        result = BarEvent(0, None, None, None, None, None)
+        for col in self.columns:
+            value = row[self.col_indices[col.column]]
+            if not value or value == "null":
+                continue
+            col.map(value, result)
+        return result
+
+    def map_columns(self, columns: typing.List[typing.Sequence[str]]) -> BarBatch:
+        """
+        Maps whole columns of the file at once.
+        Missing values become NaN.
+        """
+        count = len(columns[0])
+        fields = {
+            field: numpy.full(count, numpy.nan)
+            for field in ("open", "high", "low", "close", "volume")
+        }
+        for col in self.columns:
+            fields[col.field] = col.map_column(columns[self.col_indices[col.column]])
+        return BarBatch(
+            timestamps=fields["timestamp"],
+            open=fields["open"],
+            high=fields["high"],
+            low=fields["low"],
+            close=fields["close"],
+            volume=fields["volume"],
+        )
+    
+    @classmethod
+    def try_make(self, columns: typing.List[CsvColumnMapping], header: typing.List[str]):
+        if all(col.column in header for col in columns):
+            return CsvColumnMapper(columns, header)
+
+
+class CsvBarHistory(BatchBarHistory):
+    path: str
+    columns: typing.List[CsvColumnMapping]|None = None
+    cache: ColumnCache|None = None
+    offset: int|None = None
+    loaded: bool = False
+
+    def __init__(self, path: str, columns: typing.List[CsvColumnMapping]|None = None, cache: ColumnCache|None = None):
+        self.path = path
+        self.cache = cache
+        if columns is not None:
+            self.set_columns(columns)
+
+    def set_columns(self, columns: typing.List[CsvColumnMapping]):
+        self.columns = columns
+
+    def start(self):
+        self.index = 0
+        self.count = 0
+        self.offset = None
+        self.loaded = False
+
+    def _ensure_loaded(self) -> bool:
+        if self.loaded:
+            return False
+        self.loaded = True
+        start = time.perf_counter()
+        if self.cache is not None and self.offset is None:
+            self.data = self.load_cached()
+        else:
+            self.data = self.load(self.offset)
+        self.count = len(self.data) if self.data is not None else 0
+        if self.profiler is not None:
+            self.profiler.add_load(self.path, time.perf_counter() - start, self.count)
+        return True
+
+    def load(self, offset: int|None = None) -> BarBatch|None:
+        """
+        Reads the whole file (or everything from a row offset on) into columns in one pass.
+        """
+        header, columns = read_csv_columns(self.path, offset)
+        mapper = None
+        if header and self.columns is not None:
+            mapper = CsvColumnMapper.try_make(self.columns, header)
+        if mapper is None:
+            raise NotImplementedError()
+        if not columns or not columns[0]:
+            return None
+        return mapper.map_columns(columns)
+
+    def load_cached(self) -> BarBatch|None:
+        """
+        Loads the whole file from the cache, decoding it and filling the cache if needed.
+        """
+        data = self.cache.load(self.path, self.columns)
+        if data is None:
+            data = self.load()
+            if data is not None:
+                self.cache.store(self.path, self.columns, data)
+        return data
+
+    def _find_offset(self, ns: int) -> int:
+        """
+        Binary search over the raw bytes of the file for a row boundary,
+        such that all rows before it are older than the timestamp.
+        Only the rows at the probed offsets are parsed.
+        """
+        mapping = next(col for col in self.columns if col.field == "timestamp")
+        with open(self.path, "rb") as fh:
+            header = next(csv.reader([fh.readline().decode("utf-8")]))
+            column = header.index(mapping.column)
+            lo = fh.tell()
+            hi = os.fstat(fh.fileno()).st_size
+            while hi - lo > CSV_SEEK_BLOCK:
+                mid = (lo + hi) // 2
+                fh.seek(mid)
+                fh.readline()
+                row_start = fh.tell()
+                row = next(csv.reader([fh.readline().decode("utf-8")]), None)
+                if not row or len(row) <= column or row[column] in NULL_VALUES:
+                    hi = mid
+                elif datetime_to_ns(mapping.parse(row[column])) >= ns:
+                    hi = mid
+                else:
+                    lo = row_start
+        return lo
+
+    def seek(self, timestamp: datetime.datetime) -> bool:
+        if not self.loaded:
+            # cached columns are mapped whole and searched, only parsing skips the rows before the timestamp
+            if self.cache is None:
+                self.offset = self._find_offset(datetime_to_ns(timestamp))
+            self._ensure_loaded()
+        return super().seek(timestamp)
+
+    def position(self) -> typing.Any:
+        # the byte offset the data was loaded from and the row within it
+        return (self.offset, self.index)
+
+    def restore(self, position: typing.Any) -> bool:
+        self.offset, index = position
+        self.loaded = False
+        self._ensure_loaded()
+        self.index = index
+        return True
+
+    def next(self) -> BarEvent|None:
+        bar = super().next()
+        if bar is None and self._ensure_loaded():
+            bar = super().next()
+        if bar is None:
+            self.stop()
+        return bar
+
+    def next_batch(self, count: int) -> BarBatch|None:
+        batch = super().next_batch(count)
+        if batch is None and self._ensure_loaded():
+            batch = super().next_batch(count)
+        if batch is None:
+            self.stop()
+        return batch
+
+    def stop(self):
+        self.data = None
+        self.count = 0
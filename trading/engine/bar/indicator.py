@@ -0,0 +1,351 @@
+import collections
+import math
+import typing
+
+import numpy
+
+from engine.bar.event import BarBatch, BarEvent
+
+# longest run of the exponential average evaluated in closed form,
+# the scale of the terms grows up to this factor within one run
+EWM_MAX_SCALE = 1e12
+EWM_MAX_RUN = 4096
+
+
+def ewm(values: numpy.ndarray, alpha: float, initial: float) -> numpy.ndarray:
+    """
+    Evaluates y[i] = (1 - alpha) * y[i - 1] + alpha * values[i] with y[-1] = initial,
+    in closed form over runs of values instead of one step at a time.
+    """
+    if alpha >= 1.0:
+        return values.astype(numpy.float64)
+    decay = 1.0 - alpha
+    run = max(1, min(EWM_MAX_RUN, int(math.log(EWM_MAX_SCALE) / -math.log(decay))))
+    result = numpy.empty(len(values))
+    powers = decay ** numpy.arange(run + 1)
+    previous = initial
+    for start in range(0, len(values), run):
+        chunk = values[start:start + run]
+        size = len(chunk)
+        # y[t] = decay^(t+1) * previous + alpha * decay^t * sum(values[k] / decay^k for k <= t)
+        scaled = numpy.cumsum(chunk / powers[:size])
+        result[start:start + size] = powers[1:size + 1] * previous + alpha * powers[:size] * scaled
+        previous = result[start + size - 1]
+    return result
+
+
+class SeededAverage:
+    """
+    Exponential average seeded with the simple mean of its first period values,
+    the convention of TA-Lib for EMA and the Wilder averages.
+    """
+    period: int
+    alpha: float
+    seen: int
+    seed_sum: float
+    value: float
+
+    def __init__(self, period: int, alpha: float):
+        self.period = period
+        self.alpha = alpha
+        self.seen = 0
+        self.seed_sum = 0.0
+        self.value = math.nan
+
+    def compute(self, values: numpy.ndarray) -> numpy.ndarray:
+        result = numpy.full(len(values), math.nan)
+        start = 0
+        if self.seen < self.period:
+            head = values[:self.period - self.seen]
+            if len(head) == 0:
+                return result
+            sums = self.seed_sum + numpy.cumsum(head)
+            self.seed_sum = float(sums[-1])
+            self.seen += len(head)
+            start = len(head)
+            if self.seen < self.period:
+                return result
+            self.value = self.seed_sum / self.period
+            result[start - 1] = self.value
+        if start < len(values):
+            result[start:] = ewm(values[start:], self.alpha, self.value)
+            self.value = float(result[-1])
+        return result
+
+    def update(self, value: float) -> float:
+        if self.seen < self.period:
+            self.seed_sum += value
+            self.seen += 1
+            if self.seen < self.period:
+                return math.nan
+            self.value = self.seed_sum / self.period
+            return self.value
+        self.value = (1.0 - self.alpha) * self.value + self.alpha * value
+        return self.value
+
+
+class Indicator:
+    """
+    A technical indicator over bars.
+    compute() evaluates a whole block of bars at once, update() a single bar.
+    Both continue from where the previous call left off,
+    so blocks and single bars can be mixed and give the same values
+    (up to floating point rounding). Values are NaN until the indicator has warmed up.
+    Bars with a NaN in any of the fields the indicator reads are skipped,
+    the indicator holds its last values over them.
+    Subclasses implement _compute() and _update(), which only ever see complete bars.
+    """
+    outputs: typing.Tuple[str, ...] = ("value",)
+    fields: typing.Tuple[str, ...] = ("close",)
+    held: typing.List[float]|None = None
+
+    def compute(self, batch: BarBatch) -> typing.List[numpy.ndarray]:
+        valid = numpy.logical_and.reduce([~numpy.isnan(getattr(batch, field)) for field in self.fields])
+        if valid.all():
+            result = self._compute(batch)
+        else:
+            held = self.held or [math.nan] * len(self.outputs)
+            if not valid.any():
+                return [numpy.full(len(valid), value) for value in held]
+            values = self._compute(batch[valid])
+            # every bar takes the values of the last complete bar up to it
+            last = numpy.maximum.accumulate(numpy.where(valid, numpy.arange(len(valid)), -1))
+            rank = numpy.cumsum(valid) - 1
+            result = [numpy.where(last >= 0, column[rank[last]], value) for column, value in zip(values, held)]
+        self.held = [float(column[-1]) for column in result]
+        return result
+
+    def update(self, bar: BarEvent) -> typing.List[float]:
+        for field in self.fields:
+            if math.isnan(getattr(bar, field)):
+                return list(self.held or [math.nan] * len(self.outputs))
+        self.held = self._update(bar)
+        return list(self.held)
+
+    def _compute(self, batch: BarBatch) -> typing.List[numpy.ndarray]:
+        raise NotImplementedError()
+
+    def _update(self, bar: BarEvent) -> typing.List[float]:
+        raise NotImplementedError()
+
+
+class WindowIndicator(Indicator):
+    """
+    Base for indicators over the last period values of a bar field.
+    """
+    period: int
+    field: str
+    window: typing.Deque[float]
+    sum: float
+    sum_squares: float
+    shift: float|None
+
+    def __init__(self, period: int, field: str = "close"):
+        self.period = period
+        self.field = field
+        self.fields = (field,)
+        self.window = collections.deque()
+        self.sum = 0.0
+        self.sum_squares = 0.0
+        # values are summed relative to the first one, which keeps the variance from cancelling out
+        self.shift = None
+
+    def _window_sums(self, values: numpy.ndarray) -> typing.Tuple[numpy.ndarray, numpy.ndarray]:
+        if self.shift is None:
+            self.shift = float(values[0])
+        # the values still in the window are prepended, so windows overlapping the previous block are complete
+        tail = numpy.array(self.window, dtype=numpy.float64)
+        extended = numpy.concatenate((tail, values - self.shift))
+        zero = numpy.zeros(1)
+        sums = numpy.concatenate((zero, numpy.cumsum(extended)))
+        squares = numpy.concatenate((zero, numpy.cumsum(extended * extended)))
+        ends = numpy.arange(len(tail) + 1, len(extended) + 1)
+        starts = numpy.maximum(ends - self.period, 0)
+        full = ends - starts == self.period
+        window_sum = numpy.where(full, sums[ends] - sums[starts], math.nan)
+        window_squares = numpy.where(full, squares[ends] - squares[starts], math.nan)
+        kept = extended[-(self.period - 1):] if self.period > 1 else extended[:0]
+        self.window = collections.deque(kept.tolist())
+        self.sum = float(kept.sum())
+        self.sum_squares = float((kept * kept).sum())
+        return window_sum, window_squares
+
+    def _push(self, value: float) -> bool:
+        if self.shift is None:
+            self.shift = value
+        value -= self.shift
+        self.window.append(value)
+        self.sum += value
+        self.sum_squares += value * value
+        if len(self.window) > self.period:
+            old = self.window.popleft()
+            self.sum -= old
+            self.sum_squares -= old * old
+        return len(self.window) == self.period
+
+    def _trim(self):
+        # between calls the window only keeps what the next window overlaps
+        if len(self.window) == self.period:
+            old = self.window.popleft()
+            self.sum -= old
+            self.sum_squares -= old * old
+
+
+class SMA(WindowIndicator):
+    def _compute(self, batch: BarBatch) -> typing.List[numpy.ndarray]:
+        window_sum, _ = self._window_sums(getattr(batch, self.field))
+        return [window_sum / self.period + self.shift]
+
+    def _update(self, bar: BarEvent) -> typing.List[float]:
+        full = self._push(getattr(bar, self.field))
+        value = self.sum / self.period + self.shift if full else math.nan
+        self._trim()
+        return [value]
+
+
+class Bollinger(WindowIndicator):
+    outputs = ("middle", "upper", "lower")
+
+    deviations: float
+
+    def __init__(self, period: int = 20, deviations: float = 2.0, field: str = "close"):
+        super().__init__(period, field)
+        self.deviations = deviations
+
+    def _bands(self, window_sum, window_squares):
+        mean = window_sum / self.period
+        variance = window_squares / self.period - mean * mean
+        deviation = numpy.sqrt(numpy.maximum(variance, 0.0)) * self.deviations
+        middle = mean + self.shift
+        return middle, middle + deviation, middle - deviation
+
+    def _compute(self, batch: BarBatch) -> typing.List[numpy.ndarray]:
+        window_sum, window_squares = self._window_sums(getattr(batch, self.field))
+        return list(self._bands(window_sum, window_squares))
+
+    def _update(self, bar: BarEvent) -> typing.List[float]:
+        full = self._push(getattr(bar, self.field))
+        if full:
+            result = [float(value) for value in self._bands(numpy.float64(self.sum), numpy.float64(self.sum_squares))]
+        else:
+            result = [math.nan] * 3
+        self._trim()
+        return result
+
+
+class EMA(Indicator):
+    field: str
+    average: SeededAverage
+
+    def __init__(self, period: int, field: str = "close"):
+        self.field = field
+        self.fields = (field,)
+        self.average = SeededAverage(period, 2.0 / (period + 1))
+
+    def _compute(self, batch: BarBatch) -> typing.List[numpy.ndarray]:
+        return [self.average.compute(getattr(batch, self.field))]
+
+    def _update(self, bar: BarEvent) -> typing.List[float]:
+        return [self.average.update(getattr(bar, self.field))]
+
+
+class RSI(Indicator):
+    """
+    Relative strength index with Wilder smoothing.
+    """
+    gains: SeededAverage
+    losses: SeededAverage
+    previous: float
+
+    def __init__(self, period: int = 14):
+        self.gains = SeededAverage(period, 1.0 / period)
+        self.losses = SeededAverage(period, 1.0 / period)
+        self.previous = math.nan
+
+    def _compute(self, batch: BarBatch) -> typing.List[numpy.ndarray]:
+        close = batch.close
+        result = numpy.full(len(close), math.nan)
+        previous = numpy.concatenate(([self.previous], close[:-1]))
+        self.previous = float(close[-1])
+        # the very first bar has no change yet
+        first = 1 if math.isnan(previous[0]) else 0
+        delta = close[first:] - previous[first:]
+        gain = self.gains.compute(numpy.maximum(delta, 0.0))
+        loss = self.losses.compute(numpy.maximum(-delta, 0.0))
+        total = gain + loss
+        flat = total == 0
+        result[first:] = numpy.where(flat, 0.0, 100.0 * gain / numpy.where(flat, 1.0, total))
+        return [result]
+
+    def _update(self, bar: BarEvent) -> typing.List[float]:
+        previous = self.previous
+        self.previous = bar.close
+        if math.isnan(previous):
+            return [math.nan]
+        delta = bar.close - previous
+        gain = self.gains.update(max(delta, 0.0))
+        loss = self.losses.update(max(-delta, 0.0))
+        total = gain + loss
+        return [100.0 * gain / total if total != 0 else 0.0]
+
+
+class ATR(Indicator):
+    """
+    Average true range with Wilder smoothing.
+    """
+    fields = ("high", "low", "close")
+
+    average: SeededAverage
+    previous: float
+
+    def __init__(self, period: int = 14):
+        self.average = SeededAverage(period, 1.0 / period)
+        self.previous = math.nan
+
+    def _compute(self, batch: BarBatch) -> typing.List[numpy.ndarray]:
+        previous = numpy.concatenate(([self.previous], batch.close[:-1]))
+        self.previous = float(batch.close[-1])
+        # fmax skips the missing previous close of the very first bar
+        true_range = numpy.fmax(batch.high - batch.low, numpy.fmax(numpy.abs(batch.high - previous), numpy.abs(batch.low - previous)))
+        return [self.average.compute(true_range)]
+
+    def _update(self, bar: BarEvent) -> typing.List[float]:
+        previous = self.previous
+        self.previous = bar.close
+        true_range = bar.high - bar.low
+        if not math.isnan(previous):
+            true_range = max(true_range, abs(bar.high - previous), abs(bar.low - previous))
+        return [self.average.update(true_range)]
+
+
+class IndicatorSet:
+    """
+    Named indicators of one bar feed.
+    Values are attached to the emitted bars and batches as their indicators,
+    under the indicator name, or "name.output" for indicators with several outputs.
+    """
+    indicators: typing.Dict[str, Indicator]
+
+    def __init__(self, indicators: typing.Dict[str, Indicator]|None = None):
+        self.indicators = dict(indicators or {})
+
+    def add(self, name: str, indicator: Indicator):
+        self.indicators[name] = indicator
+
+    @staticmethod
+    def _keys(name: str, indicator: Indicator) -> typing.List[str]:
+        if len(indicator.outputs) == 1:
+            return [name]
+        return [f"{name}.{output}" for output in indicator.outputs]
+
+    def compute(self, batch: BarBatch):
+        values = {}
+        for name, indicator in self.indicators.items():
+            values.update(zip(self._keys(name, indicator), indicator.compute(batch)))
+        batch.indicators = values
+
+    def update(self, bar: BarEvent):
+        values = {}
+        for name, indicator in self.indicators.items():
+            values.update(zip(self._keys(name, indicator), indicator.update(bar)))
+        bar.indicators = values
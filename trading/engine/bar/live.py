@@ -1,44 +1,141 @@
-import asyncio
-from datetime import datetime, timedelta
-
-from engine.bar.event import BarEvent
-
-ZERO_TIMEDELTA = timedelta()
-
-
-class BarLiveFeed:
-    LEEWAY = timedelta(seconds=3)
-
-    ticker: str
-    interval: timedelta
-    last_poll: datetime|None = None
-
-    def __init__(self, ticker: str, interval: timedelta):
-        self.ticker = ticker
-        self.interval = interval
-
-    def start(self):
-        """
-        Starts the live feed.
-        Called once before the first call to next().
-        """
-
-    async def next(self) -> BarEvent|None:
-        start = self.last_poll or datetime.utcnow()
-        until_end = self.interval - ((start - datetime.min) % self.interval)
-        target = start + until_end - self.interval
-        delay = target + self.interval - datetime.utcnow()
-        if delay > ZERO_TIMEDELTA:
-            await asyncio.sleep((delay + self.LEEWAY).total_seconds())
-        self.last_poll = datetime.utcnow()
-        return await self._fetch(target)
-
-    def stop(self):
-        """
-        Stops the live feed.
-        Called once after the last call to next().
-        Note that stop() will be called, even if start() was not.
-        """
-
-    async def _fetch(self, target: datetime) -> BarEvent|None:
-        raise NotImplementedError()
+import asyncio
+from datetime import datetime, timedelta
+import typing
+
+from engine.bar.event import BarEvent
+
+ZERO_TIMEDELTA = timedelta()
+
+
+class BarLiveFeed:
+    LEEWAY = timedelta(seconds=3)
+
+    ticker: str
+    interval: timedelta
+    scheduler: "LiveScheduler|None"
+    last_poll: datetime|None = None
+
+    def __init__(self, ticker: str, interval: timedelta, scheduler: "LiveScheduler|None" = None):
+        self.ticker = ticker
+        self.interval = interval
+        self.scheduler = scheduler
+
+    def start(self):
+        """
+        Starts the live feed.
+        Called once before the first call to next().
+        """
+        if self.scheduler is not None:
+            self.scheduler.register(self)
+
+    async def next(self) -> BarEvent|None:
+        if self.scheduler is not None:
+            return await self.scheduler.next(self)
+        start = self.last_poll or datetime.utcnow()
+        until_end = self.interval - ((start - datetime.min) % self.interval)
+        target = start + until_end - self.interval
+        delay = target + self.interval - datetime.utcnow()
+        if delay > ZERO_TIMEDELTA:
+            await asyncio.sleep((delay + self.LEEWAY).total_seconds())
+        self.last_poll = datetime.utcnow()
+        return await self._fetch(target)
+
+    def stop(self):
+        """
+        Stops the live feed.
+        Called once after the last call to next().
+        Note that stop() will be called, even if start() was not.
+        """
+        if self.scheduler is not None:
+            self.scheduler.unregister(self)
+
+    async def aclose(self):
+        """
+        Releases resources bound to the event loop.
+        Awaited once after stop(), on the loop the feed ran on.
+        """
+        pass
+
+    async def _fetch(self, target: datetime) -> BarEvent|None:
+        raise NotImplementedError()
+
+    @classmethod
+    async def fetch_many(cls, feeds: typing.List["BarLiveFeed"], target: datetime) -> typing.List[BarEvent|BaseException|None]:
+        """
+        Fetches the bars of several feeds of this class for the same interval.
+        Providers with multi-symbol requests override this to batch the tickers,
+        by default every feed fetches its own bar and all requests go out together.
+        """
+        return await asyncio.gather(*(feed._fetch(target) for feed in feeds), return_exceptions=True)
+
+
+class LiveScheduler:
+    """
+    A timer wheel shared by live feeds.
+    There is one timer per interval, which wakes once per interval boundary (plus LEEWAY),
+    fetches the bars of all feeds registered with that interval together
+    and hands each feed its bar through its own queue.
+    Feeds are grouped by class, so each provider can batch its tickers in fetch_many().
+    """
+    LEEWAY = BarLiveFeed.LEEWAY
+
+    feeds: typing.Dict[timedelta, typing.List[BarLiveFeed]]
+    queues: typing.Dict[BarLiveFeed, asyncio.Queue]
+    timers: typing.Dict[timedelta, asyncio.Task]
+
+    def __init__(self):
+        self.feeds = {}
+        self.queues = {}
+        self.timers = {}
+
+    def register(self, feed: BarLiveFeed):
+        if feed in self.queues:
+            return
+        self.feeds.setdefault(feed.interval, []).append(feed)
+        self.queues[feed] = asyncio.Queue()
+
+    def unregister(self, feed: BarLiveFeed):
+        if self.queues.pop(feed, None) is None:
+            return
+        feeds = self.feeds[feed.interval]
+        feeds.remove(feed)
+        if not feeds:
+            del self.feeds[feed.interval]
+            timer = self.timers.pop(feed.interval, None)
+            if timer is not None:
+                timer.cancel()
+
+    async def next(self, feed: BarLiveFeed) -> BarEvent|None:
+        if feed.interval not in self.timers:
+            self.timers[feed.interval] = asyncio.get_running_loop().create_task(self._run(feed.interval))
+        result = await self.queues[feed].get()
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def _run(self, interval: timedelta):
+        while True:
+            now = datetime.utcnow()
+            target = now - ((now - datetime.min) % interval)
+            delay = target + interval - now + self.LEEWAY
+            await asyncio.sleep(delay.total_seconds())
+            await self._fan_out(interval, target)
+
+    async def _fan_out(self, interval: timedelta, target: datetime):
+        groups: typing.Dict[type, typing.List[BarLiveFeed]] = {}
+        for feed in self.feeds.get(interval, []):
+            groups.setdefault(type(feed), []).append(feed)
+        groups_list = list(groups.items())
+        results = await asyncio.gather(*(cls.fetch_many(feeds, target) for cls, feeds in groups_list), return_exceptions=True)
+        for (_, feeds), bars in zip(groups_list, results):
+            if isinstance(bars, BaseException):
+                bars = [bars] * len(feeds)
+            for feed, bar in zip(feeds, bars):
+                queue = self.queues.get(feed)
+                if queue is not None:
+                    feed.last_poll = datetime.utcnow()
+                    queue.put_nowait(bar)
+
+
+# the scheduler used by the live feeds made by the provider modules
+LIVE_SCHEDULER = LiveScheduler()
@@ -0,0 +1,168 @@
+import datetime
+import queue
+import threading
+import time
+import typing
+
+from engine.bar.event import BarBatch, BarEvent
+from engine.bar.history import BarHistory
+from engine.profiler import Profiler
+
+
+class PrefetchBarHistory(BarHistory):
+    """
+    Reads another history ahead in a background thread.
+    Chunks of chunk_size bars are decoded into a queue of at most depth chunks,
+    so the reader blocks once it is that far ahead and memory stays bounded.
+    The main loop is served from the queued chunks.
+    File reads and numpy decoding release the GIL and overlap with the strategy,
+    pure Python parsing does not.
+    Every chunk is queued with the position of the history it was read from,
+    so the position of the wrapper is that position and the bars handed out of the chunk.
+    A profiler is passed on to the wrapped history, the time the thread spends reading is recorded as a load.
+    """
+    CHUNK_SIZE = 4096
+    DEPTH = 8
+
+    history: BarHistory
+    chunk_size: int
+    depth: int
+    queue: "queue.Queue[typing.Tuple[typing.Any, BarBatch|BaseException|None]]|None"
+    thread: threading.Thread|None
+    stopping: threading.Event
+    chunk: BarBatch|None
+    chunk_index: int
+    chunk_position: typing.Any
+    skip: int
+    ended: bool
+
+    def __init__(self, history: BarHistory, chunk_size: int = CHUNK_SIZE, depth: int = DEPTH):
+        self.history = history
+        self.chunk_size = chunk_size
+        self.depth = depth
+        self.queue = None
+        self.thread = None
+        self.stopping = threading.Event()
+        self.chunk = None
+        self.chunk_index = 0
+        self.chunk_position = None
+        self.skip = 0
+        self.ended = False
+
+    @property
+    def profiler(self) -> Profiler|None:
+        return self.history.profiler
+
+    @profiler.setter
+    def profiler(self, profiler: Profiler|None):
+        self.history.profiler = profiler
+
+    def start(self):
+        self._reset()
+        self.history.start()
+
+    def _reset(self):
+        self._stop_thread()
+        self.stopping.clear()
+        self.chunk = None
+        self.chunk_index = 0
+        self.chunk_position = None
+        self.skip = 0
+        self.ended = False
+
+    def seek(self, timestamp: datetime.datetime) -> bool:
+        # the reader only starts with the first read, so it reads from the new position
+        return self.history.seek(timestamp)
+
+    def position(self) -> typing.Any:
+        if self.thread is None:
+            position = self.history.position()
+            return None if position is None else (position, self.skip)
+        if self.chunk_position is None:
+            return None
+        return (self.chunk_position, self.chunk_index)
+
+    def restore(self, position: typing.Any) -> bool:
+        # chunks read ahead are dropped, the reader starts over from the restored position
+        self._reset()
+        history, self.skip = position
+        return self.history.restore(history)
+
+    def _read_ahead(self):
+        try:
+            while not self.stopping.is_set():
+                position = self.history.position()
+                start = time.perf_counter()
+                batch = self.history.next_batch(self.chunk_size)
+                profiler = self.history.profiler
+                if profiler is not None and batch is not None:
+                    profiler.add_load(f"prefetch:{type(self.history).__name__}", time.perf_counter() - start, len(batch))
+                self._put((position, batch))
+                if batch is None:
+                    return
+        except BaseException as e:
+            self._put((None, e))
+
+    def _put(self, item: typing.Tuple[typing.Any, BarBatch|BaseException|None]):
+        while not self.stopping.is_set():
+            try:
+                self.queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _next_chunk(self) -> bool:
+        if self.ended:
+            return False
+        if self.thread is None:
+            self.queue = queue.Queue(self.depth)
+            self.thread = threading.Thread(target=self._read_ahead, name="PrefetchBarHistory", daemon=True)
+            self.thread.start()
+        while True:
+            position, item = self.queue.get()
+            if isinstance(item, BaseException):
+                self.ended = True
+                raise item
+            self.chunk_position = position
+            if item is None:
+                self.ended = True
+                self.chunk = None
+                self.chunk_index = 0
+                return False
+            # bars handed out before a restore are skipped
+            skip = min(self.skip, len(item))
+            self.skip -= skip
+            if skip < len(item):
+                self.chunk = item
+                self.chunk_index = skip
+                return True
+
+    def next(self) -> BarEvent|None:
+        if self.chunk is None or self.chunk_index >= len(self.chunk):
+            if not self._next_chunk():
+                return None
+        bar = self.chunk.bar(self.chunk_index)
+        self.chunk_index += 1
+        return bar
+
+    def next_batch(self, count: int) -> BarBatch|None:
+        if self.chunk is None or self.chunk_index >= len(self.chunk):
+            if not self._next_chunk():
+                return None
+        start = self.chunk_index
+        self.chunk_index = min(start + count, len(self.chunk))
+        if start == 0 and self.chunk_index == len(self.chunk):
+            return self.chunk
+        return self.chunk[start:self.chunk_index]
+
+    def _stop_thread(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.queue = None
+
+    def stop(self):
+        self._stop_thread()
+        self.chunk = None
+        self.history.stop()
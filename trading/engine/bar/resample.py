@@ -0,0 +1,233 @@
+import collections
+from datetime import datetime, timedelta, timezone
+import math
+import typing
+
+import numpy
+
+from engine.bar.event import BarBatch, BarEvent
+from engine.bar.feed import BarFeed
+from engine.feed import EventFeed, datetime_to_ns, ns_to_datetime
+
+
+def timedelta_to_ns(delta: timedelta) -> int:
+    return delta // timedelta(microseconds=1) * 1000
+
+
+class OpenBar:
+    """
+    The bar of the interval that has not closed yet.
+    """
+    __slots__ = ("bucket", "last_ns", "open", "high", "low", "close", "volume")
+    bucket: int
+    last_ns: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+    def __init__(self, bucket: int, last_ns: int, open: float, high: float, low: float, close: float, volume: float):
+        self.bucket = bucket
+        self.last_ns = last_ns
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def fold(self, bar: BarEvent):
+        self.last_ns = bar.ns
+        self.high = max(self.high, bar.high)
+        self.low = min(self.low, bar.low)
+        self.close = bar.close
+        self.volume += bar.volume if not math.isnan(bar.volume) else 0.0
+
+    def to_event(self, ns: int) -> BarEvent:
+        return BarEvent(ns, self.open, self.high, self.low, self.close, self.volume)
+
+
+class ResampledBarFeed(EventFeed[BarEvent]):
+    """
+    Aggregates the bars of another BarFeed into a longer interval.
+    Intervals are aligned to the epoch, so daily bars start at midnight UTC.
+    A bar is emitted once its interval has closed and is stamped with its close time, the end of the interval,
+    so it never comes before the source bars it summarizes.
+    An interval the source ended in is emitted with what it has, stamped with the close of its last source bar.
+    History is aggregated a block at a time, live bars are folded into the open bar one by one.
+    """
+    BLOCK_SIZE = 4096
+
+    source: BarFeed
+    interval: timedelta
+    source_interval: timedelta
+    interval_ns: int
+    source_interval_ns: int
+    batch_size: int|None = None
+    open_bar: OpenBar|None
+    completed: BarBatch|None
+    completed_index: int
+    ready: typing.Deque[BarEvent]
+    source_ended: bool
+
+    def __init__(self, source: BarFeed, interval: timedelta, source_interval: timedelta):
+        self.source = source
+        self.interval = interval
+        self.source_interval = source_interval
+        self.interval_ns = timedelta_to_ns(interval)
+        self.source_interval_ns = timedelta_to_ns(source_interval)
+        self.open_bar = None
+        self.completed = None
+        self.completed_index = 0
+        self.ready = collections.deque()
+        self.source_ended = False
+
+    def start(self):
+        self.source.batch_size = self.BLOCK_SIZE
+        self.source.start()
+
+    def seek(self, timestamp: datetime) -> bool:
+        # bars are stamped with the end of their interval,
+        # the first one due is of the interval that ends at or after the timestamp
+        ns = datetime_to_ns(timestamp)
+        bucket = -(-ns // self.interval_ns) - 1
+        return self.source.seek(ns_to_datetime(bucket * self.interval_ns))
+
+    def position(self) -> typing.Any:
+        source = self.source.position() if not self.source.history_ended else None
+        if source is None and not self.source.history_ended:
+            return None
+        return (self.source.history_ended, source, self.open_bar, self.completed, self.completed_index)
+
+    def restore(self, position: typing.Any) -> bool:
+        ended, source, self.open_bar, self.completed, self.completed_index = position
+        if ended:
+            self.source.history_ended = True
+            return True
+        return self.source.restore(source)
+
+    def _aggregate(self, batch: BarBatch):
+        valid = ~numpy.isnan(batch.close)
+        timestamps = batch.timestamps[valid]
+        open = batch.open[valid]
+        high = batch.high[valid]
+        low = batch.low[valid]
+        close = batch.close[valid]
+        volume = numpy.nan_to_num(batch.volume[valid])
+        if self.open_bar is not None:
+            # the open bar goes first, as if it was a single source bar
+            bar = self.open_bar
+            timestamps = numpy.concatenate(([bar.last_ns], timestamps))
+            open = numpy.concatenate(([bar.open], open))
+            high = numpy.concatenate(([bar.high], high))
+            low = numpy.concatenate(([bar.low], low))
+            close = numpy.concatenate(([bar.close], close))
+            volume = numpy.concatenate(([bar.volume], volume))
+            buckets = numpy.concatenate(([bar.bucket], timestamps[1:] // self.interval_ns))
+            self.open_bar = None
+        else:
+            buckets = timestamps // self.interval_ns
+        if len(timestamps) == 0:
+            return
+        starts = numpy.concatenate(([0], numpy.flatnonzero(numpy.diff(buckets)) + 1))
+        ends = numpy.concatenate((starts[1:], [len(timestamps)]))
+        buckets = buckets[starts]
+        last = timestamps[ends - 1]
+        open = open[starts]
+        high = numpy.fmax.reduceat(high, starts)
+        low = numpy.fmin.reduceat(low, starts)
+        close = close[ends - 1]
+        volume = numpy.add.reduceat(volume, starts)
+        count = len(starts)
+        if last[-1] + self.source_interval_ns < (buckets[-1] + 1) * self.interval_ns:
+            # the last interval may continue in the next block
+            count -= 1
+            self.open_bar = OpenBar(int(buckets[-1]), int(last[-1]), float(open[-1]), float(high[-1]), float(low[-1]), float(close[-1]), float(volume[-1]))
+        if count > 0:
+            self.completed = BarBatch(
+                timestamps=(buckets[:count] + 1) * self.interval_ns,
+                open=open[:count],
+                high=high[:count],
+                low=low[:count],
+                close=close[:count],
+                volume=volume[:count],
+            )
+            self.completed_index = 0
+
+    def _partial_ns(self, bar: OpenBar) -> int:
+        return min(bar.last_ns + self.source_interval_ns, (bar.bucket + 1) * self.interval_ns)
+
+    def _flush_history(self) -> bool:
+        # the interval the history ended in is emitted as it is,
+        # whether it has closed depends on nothing but the data
+        if self.open_bar is None:
+            return False
+        bar = self.open_bar
+        self.open_bar = None
+        self.completed = BarBatch(
+            timestamps=numpy.array([self._partial_ns(bar)], dtype=numpy.int64),
+            open=numpy.array([bar.open]),
+            high=numpy.array([bar.high]),
+            low=numpy.array([bar.low]),
+            close=numpy.array([bar.close]),
+            volume=numpy.array([bar.volume]),
+        )
+        self.completed_index = 0
+        return True
+
+    def _historical_next(self) -> BarEvent|BarBatch|None:
+        while self.completed is None or self.completed_index >= len(self.completed):
+            self.completed = None
+            batch = self.source.next_historical()
+            if batch is None:
+                if not self._flush_history():
+                    return None
+            elif isinstance(batch, BarBatch):
+                self._aggregate(batch)
+            else:
+                self._aggregate(BarBatch.from_bars([batch]))
+        index = self.completed_index
+        if self.batch_size is None:
+            self.completed_index += 1
+            return self.completed.bar(index)
+        self.completed_index = min(index + self.batch_size, len(self.completed))
+        return self.completed[index:self.completed_index]
+
+    def start_live(self):
+        self.live_since = self.live_since - ((self.live_since - datetime.min.replace(tzinfo=timezone.utc)) % self.interval)
+
+    def _fold(self, bar: BarEvent):
+        if math.isnan(bar.close):
+            return
+        bucket = bar.ns // self.interval_ns
+        if self.open_bar is not None and self.open_bar.bucket != bucket:
+            self.ready.append(self.open_bar.to_event((self.open_bar.bucket + 1) * self.interval_ns))
+            self.open_bar = None
+        if self.open_bar is None:
+            volume = bar.volume if not math.isnan(bar.volume) else 0.0
+            self.open_bar = OpenBar(bucket, bar.ns, bar.open, bar.high, bar.low, bar.close, volume)
+        else:
+            self.open_bar.fold(bar)
+        if bar.ns + self.source_interval_ns >= (bucket + 1) * self.interval_ns:
+            self.ready.append(self.open_bar.to_event((bucket + 1) * self.interval_ns))
+            self.open_bar = None
+
+    async def _live_next(self) -> BarEvent|None:
+        while not self.ready:
+            if self.source_ended:
+                return None
+            bar = await self.source.next()
+            if bar is None:
+                self.source_ended = True
+                if self.open_bar is not None:
+                    self.ready.append(self.open_bar.to_event(self._partial_ns(self.open_bar)))
+                    self.open_bar = None
+                continue
+            self._fold(bar)
+        return self.ready.popleft()
+
+    def stop(self):
+        self.source.stop()
+
+    async def aclose(self):
+        await self.source.aclose()
@@ -0,0 +1,105 @@
+import bisect
+import datetime
+import typing
+
+import numpy
+
+from collect.bar.data import Bar, BarRecords
+from engine.bar.event import BarBatch, BarEvent
+from engine.bar.history import ArrayBarHistory
+from engine.feed import datetime_to_ns
+
+NS_PER_SECOND = 1000000000
+
+
+def records_to_batch(records: numpy.ndarray) -> BarBatch:
+    """
+    Converts raw BAR8 records into a BarBatch.
+    """
+    return BarBatch(
+        timestamps=records["timestamp"].astype(numpy.int64) * NS_PER_SECOND,
+        open=records["open"] / Bar.FIXED_POINT_MULTIPLIER,
+        high=records["high"] / Bar.FIXED_POINT_MULTIPLIER,
+        low=records["low"] / Bar.FIXED_POINT_MULTIPLIER,
+        close=records["close"] / Bar.FIXED_POINT_MULTIPLIER,
+        volume=records["volume"].astype(numpy.float64),
+    )
+
+
+def map_records(path: str) -> numpy.ndarray|None:
+    """
+    Memory-maps the records of a BAR8 file, BAR9 files are decompressed into memory.
+    Returns None for files without records.
+    """
+    records = BarRecords.from_file(path)
+    return records.records if len(records) else None
+
+
+class StoreBarHistory(ArrayBarHistory):
+    """
+    Replays bars straight from the binary files of the collect.bar store.
+    The yearly files are memory-mapped back to back,
+    prices are converted from fixed point only for the bars that are read.
+    """
+    paths: typing.List[str]
+    records: typing.List[numpy.ndarray]
+    starts: typing.List[int]
+
+    def __init__(self, paths: typing.List[str]):
+        self.paths = paths
+        self.records = []
+        self.starts = []
+
+    def start(self):
+        self.records = [records for records in map(map_records, self.paths) if records is not None]
+        self.starts = []
+        count = 0
+        for records in self.records:
+            self.starts.append(count)
+            count += len(records)
+        self.index = 0
+        self.count = count
+
+    def seek(self, timestamp: datetime.datetime) -> bool:
+        seconds = -(-datetime_to_ns(timestamp) // NS_PER_SECOND)
+        self.index = self.count
+        for start, records in zip(self.starts, self.records):
+            # binary search over the mapped timestamps only touches a few pages
+            if records[-1]["timestamp"] >= seconds:
+                self.index = start + int(numpy.searchsorted(records["timestamp"], seconds))
+                break
+        return True
+
+    def _locate(self, index: int) -> typing.Tuple[int, int]:
+        file = bisect.bisect_right(self.starts, index) - 1
+        return file, index - self.starts[file]
+
+    def _bar(self, index: int) -> BarEvent:
+        file, local = self._locate(index)
+        record = self.records[file][local]
+        return BarEvent(
+            timestamp=int(record["timestamp"]) * NS_PER_SECOND,
+            open=int(record["open"]) / Bar.FIXED_POINT_MULTIPLIER,
+            high=int(record["high"]) / Bar.FIXED_POINT_MULTIPLIER,
+            low=int(record["low"]) / Bar.FIXED_POINT_MULTIPLIER,
+            close=int(record["close"]) / Bar.FIXED_POINT_MULTIPLIER,
+            volume=float(record["volume"]),
+        )
+
+    def _slice(self, start: int, stop: int) -> BarBatch:
+        file, local = self._locate(start)
+        parts = []
+        while start < stop:
+            records = self.records[file]
+            take = min(stop - start, len(records) - local)
+            parts.append(records[local:local + take])
+            start += take
+            file += 1
+            local = 0
+        records = parts[0] if len(parts) == 1 else numpy.concatenate(parts)
+        return records_to_batch(records)
+
+    def stop(self):
+        self.records = []
+        self.starts = []
+        self.count = 0
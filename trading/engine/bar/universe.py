@@ -0,0 +1,278 @@
+import datetime
+import json
+import os
+import struct
+import typing
+
+import numpy
+
+from collect.bar.data import Bar, ChunkedBarFile, read_marker
+from collect.bar.engine import BarFrequency, BarReader
+from engine.bar.event import BarBatch, BarEvent
+from engine.bar.feed import BarFeed
+from engine.bar.history import ArrayBarHistory
+from engine.bar.store import NS_PER_SECOND
+from engine.feed import datetime_to_ns
+
+# records merged and written per step of a universe build, across all symbols
+MERGE_CHUNK_SIZE = 1 << 20
+UNIVERSE_MARKER = "UNI8"
+UNIVERSE_HEADER = "<Q"
+UNIVERSE_DTYPE = numpy.dtype([
+    ("timestamp", "<u8"),
+    ("symbol", "<u8"),
+    ("open", "<u8"),
+    ("high", "<u8"),
+    ("low", "<u8"),
+    ("close", "<u8"),
+    ("volume", "<u8"),
+])
+
+
+class SymbolBarEvent(BarEvent):
+    __slots__ = ("symbol",)
+    symbol: str
+
+    def __init__(self, timestamp: datetime.datetime|int, symbol: str, open: float, high: float, low: float, close: float, volume: float):
+        super().__init__(timestamp, open, high, low, close, volume)
+        self.symbol = symbol
+
+
+class SymbolBarBatch(BarBatch):
+    """
+    Bars of many symbols in timestamp order.
+    Symbols are stored as indices into names.
+    """
+    __slots__ = ("symbols", "names")
+    symbols: numpy.ndarray
+    names: typing.List[str]
+
+    def __init__(self, timestamps: numpy.ndarray, symbols: numpy.ndarray, names: typing.List[str], open: numpy.ndarray, high: numpy.ndarray, low: numpy.ndarray, close: numpy.ndarray, volume: numpy.ndarray):
+        super().__init__(timestamps, open, high, low, close, volume)
+        self.symbols = symbols
+        self.names = names
+
+    def __getitem__(self, index: slice) -> "SymbolBarBatch":
+        return SymbolBarBatch(
+            timestamps=self.timestamps[index],
+            symbols=self.symbols[index],
+            names=self.names,
+            open=self.open[index],
+            high=self.high[index],
+            low=self.low[index],
+            close=self.close[index],
+            volume=self.volume[index],
+        )
+
+    def bar(self, index: int) -> SymbolBarEvent:
+        result = SymbolBarEvent(
+            timestamp=int(self.timestamps[index]),
+            symbol=self.names[self.symbols[index]],
+            open=float(self.open[index]),
+            high=float(self.high[index]),
+            low=float(self.low[index]),
+            close=float(self.close[index]),
+            volume=float(self.volume[index]),
+        )
+        result.feed = self.feed
+        return result
+
+
+def _write_header(fh, names: typing.List[str]):
+    table = json.dumps(names).encode("utf-8")
+    # records start 8-byte aligned, so they can be mapped directly
+    table += b" " * (-(len(UNIVERSE_MARKER) + struct.calcsize(UNIVERSE_HEADER) + len(table)) % 8)
+    fh.write(UNIVERSE_MARKER.encode("ascii"))
+    fh.write(struct.pack(UNIVERSE_HEADER, len(table)))
+    fh.write(table)
+
+
+def read_universe(path: str) -> typing.Tuple[typing.List[str], numpy.ndarray|None]:
+    """
+    Reads the symbol table of a universe file and memory-maps its records.
+    """
+    with open(path, "rb") as fh:
+        marker = fh.read(len(UNIVERSE_MARKER)).decode("ascii")
+        if marker != UNIVERSE_MARKER:
+            raise Exception(f"Existing marker {marker} does not match {UNIVERSE_MARKER}")
+        length, = struct.unpack(UNIVERSE_HEADER, fh.read(struct.calcsize(UNIVERSE_HEADER)))
+        names = json.loads(fh.read(length).decode("utf-8"))
+        offset = fh.tell()
+    count = (os.path.getsize(path) - offset) // UNIVERSE_DTYPE.itemsize
+    if count <= 0:
+        return names, None
+    return names, numpy.memmap(path, dtype=UNIVERSE_DTYPE, mode="r", offset=offset, shape=(count,))
+
+
+class MergeSource:
+    """
+    One file of a universe period, read a window of records at a time.
+    The file is only open while reading, so thousands of sources can be merged at once.
+    """
+    symbol: int
+    path: str
+    chunked: ChunkedBarFile|None
+    count: int
+    cursor: int
+    window: numpy.ndarray
+
+    def __init__(self, symbol: int, path: str):
+        self.symbol = symbol
+        self.path = path
+        marker = read_marker(path)
+        if marker == ChunkedBarFile.MARKER:
+            self.chunked = ChunkedBarFile(path)
+            self.count = len(self.chunked)
+        elif marker == Bar.MARKER:
+            self.chunked = None
+            self.count = (os.path.getsize(path) - len(Bar.MARKER)) // Bar.BINARY_SIZE
+        else:
+            raise Exception(f"Existing marker {marker} does not match {Bar.MARKER}")
+        self.cursor = 0
+        self.window = numpy.empty(0, dtype=Bar.DTYPE)
+
+    @property
+    def ended(self) -> bool:
+        return len(self.window) == 0 and self.cursor >= self.count
+
+    def fill(self, size: int):
+        """
+        Tops the window up to size records.
+        """
+        count = min(size - len(self.window), self.count - self.cursor)
+        if count <= 0:
+            return
+        if self.chunked is not None:
+            records = self.chunked.read(self.cursor, self.cursor + count)
+        else:
+            with open(self.path, "rb") as fh:
+                fh.seek(len(Bar.MARKER) + self.cursor * Bar.BINARY_SIZE, os.SEEK_SET)
+                records = numpy.frombuffer(fh.read(count * Bar.BINARY_SIZE), dtype=Bar.DTYPE)
+        self.cursor += count
+        self.window = numpy.concatenate((self.window, records)) if len(self.window) else records
+
+    def take(self, horizon: int) -> numpy.ndarray|None:
+        """
+        Removes the records up to the horizon (inclusive) from the window, as universe records.
+        """
+        count = int(numpy.searchsorted(self.window["timestamp"], horizon, side="right"))
+        if count == 0:
+            return None
+        part = numpy.empty(count, dtype=UNIVERSE_DTYPE)
+        for field in Bar.DTYPE.names:
+            part[field] = self.window[field][:count]
+        part["symbol"] = self.symbol
+        self.window = self.window[count:]
+        return part
+
+
+def build_universe(path: str, sources: typing.Dict[str, typing.List[str]], chunk_size: int = MERGE_CHUNK_SIZE):
+    """
+    Merges the BAR8 (or BAR9) files of many symbols into one time-sorted universe file.
+    Files are merged one period at a time (files with the same name, such as the yearly files of the store).
+    Within a period the files are merged k-way in steps of about chunk_size records:
+    every file contributes a window of chunk_size / files records,
+    and everything up to the earliest window end is sorted and written.
+    Memory stays bounded by the step size however many symbols and bars there are.
+    Bars with equal timestamps are ordered by symbol.
+    """
+    names = list(sources)
+    periods: typing.Dict[str, typing.List[typing.Tuple[int, str]]] = {}
+    for symbol, paths in enumerate(sources.values()):
+        for file in paths:
+            periods.setdefault(os.path.basename(file), []).append((symbol, file))
+    temporary = path + ".tmp"
+    last = 0
+    with open(temporary, "wb") as fh:
+        _write_header(fh, names)
+        for period in sorted(periods):
+            # sources stay in symbol order, so a stable sort by timestamp orders ties by symbol
+            merging = [source for source in (MergeSource(symbol, file) for symbol, file in sorted(periods[period])) if source.count]
+            window = max(1, chunk_size // max(1, len(merging)))
+            while merging:
+                for source in merging:
+                    source.fill(window)
+                horizon = min(int(source.window["timestamp"][-1]) for source in merging)
+                parts = [part for part in (source.take(horizon) for source in merging) if part is not None]
+                merging = [source for source in merging if not source.ended]
+                merged = numpy.concatenate(parts)
+                merged = merged[numpy.argsort(merged["timestamp"], kind="stable")]
+                if merged["timestamp"][0] < last:
+                    raise ValueError(f"Bars of {period} overlap the previous period")
+                last = int(merged["timestamp"][-1])
+                merged.tofile(fh)
+    os.replace(temporary, path)
+
+
+def build_universe_from_store(path: str, collector, namespace: str, symbols: typing.List[str], freq: BarFrequency):
+    """
+    Builds a universe file from the per-symbol files of the collect.bar store.
+    """
+    sources = {symbol: BarReader(collector, namespace, symbol).paths(freq) for symbol in symbols}
+    build_universe(path, sources)
+
+
+class UniverseBarHistory(ArrayBarHistory):
+    """
+    Replays a universe file, the bars of all its symbols in timestamp order,
+    through a single memory map instead of a file and a feed per symbol.
+    """
+    path: str
+    names: typing.List[str]
+    records: numpy.ndarray|None
+
+    def __init__(self, path: str):
+        self.path = path
+        self.names = []
+        self.records = None
+
+    def start(self):
+        self.names, self.records = read_universe(self.path)
+        self.index = 0
+        self.count = len(self.records) if self.records is not None else 0
+
+    def seek(self, timestamp: datetime.datetime) -> bool:
+        if self.records is not None:
+            seconds = -(-datetime_to_ns(timestamp) // NS_PER_SECOND)
+            self.index = int(numpy.searchsorted(self.records["timestamp"], seconds))
+        return True
+
+    def _bar(self, index: int) -> SymbolBarEvent:
+        record = self.records[index]
+        return SymbolBarEvent(
+            timestamp=int(record["timestamp"]) * NS_PER_SECOND,
+            symbol=self.names[int(record["symbol"])],
+            open=int(record["open"]) / Bar.FIXED_POINT_MULTIPLIER,
+            high=int(record["high"]) / Bar.FIXED_POINT_MULTIPLIER,
+            low=int(record["low"]) / Bar.FIXED_POINT_MULTIPLIER,
+            close=int(record["close"]) / Bar.FIXED_POINT_MULTIPLIER,
+            volume=float(record["volume"]),
+        )
+
+    def _slice(self, start: int, stop: int) -> SymbolBarBatch:
+        records = self.records[start:stop]
+        return SymbolBarBatch(
+            timestamps=records["timestamp"].astype(numpy.int64) * NS_PER_SECOND,
+            symbols=records["symbol"].astype(numpy.intp),
+            names=self.names,
+            open=records["open"] / Bar.FIXED_POINT_MULTIPLIER,
+            high=records["high"] / Bar.FIXED_POINT_MULTIPLIER,
+            low=records["low"] / Bar.FIXED_POINT_MULTIPLIER,
+            close=records["close"] / Bar.FIXED_POINT_MULTIPLIER,
+            volume=records["volume"].astype(numpy.float64),
+        )
+
+    def stop(self):
+        self.records = None
+        self.count = 0
+
+
+def make_universe_feed(path: str, batch_size: int|None = None) -> BarFeed:
+    """
+    One feed for a whole universe, its events are SymbolBarEvents (or SymbolBarBatches) in timestamp order.
+    Indicators are per feed, so they do not apply to a universe feed.
+    """
+    feed = BarFeed()
+    feed.history = UniverseBarHistory(path)
+    feed.batch_size = batch_size
+    return feed
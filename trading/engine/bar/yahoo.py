@@ -1,94 +1,190 @@
-from datetime import datetime, timedelta, timezone
-from enum import Enum
-import requests
-
-from engine.bar.event import BarEvent
-from engine.bar.feed import BarFeed
-from engine.bar.history import CsvBarHistory, CsvColumnMapping
-from engine.bar.live import BarLiveFeed
-
-YAHOO_CSV_COLUMNS = [
-    CsvColumnMapping("Date", lambda x: datetime.strptime(x, "%Y-%m-%d").replace(tzinfo=timezone.utc), "timestamp"),
-    CsvColumnMapping("Open", float, "open"),
-    CsvColumnMapping("High", float, "high"),
-    CsvColumnMapping("Low", float, "low"),
-    CsvColumnMapping("Close", float, "close"),
-    CsvColumnMapping("Volume", float, "volume"),
-]
-
-
-class YahooInterval(Enum):
-    MIN_1 = "1m"
-    MIN_5 = "5m"
-    HOUR_1 = "1h"
-    DAY_1 = "1d"
-    DAY_5 = "5d"
-    MONTH_1 = "1mo"
-    MONTH_3 = "3mo"
-    MONTH_5 = "5mo"
-    YEAR_1 = "1y"
-    YEAR_2 = "2y"
-    YEAR_5 = "5y"
-    YEAR_10 = "10y"
-
-YAHOO_INTERVAL_TO_DELTA = {
-    YahooInterval.MIN_1: timedelta(minutes=1),
-    YahooInterval.MIN_5: timedelta(minutes=5),
-    YahooInterval.HOUR_1: timedelta(hours=1),
-    YahooInterval.DAY_1: timedelta(days=1),
-    YahooInterval.DAY_5: timedelta(days=5),
-    YahooInterval.MONTH_1: timedelta(days=30),
-    YahooInterval.MONTH_3: timedelta(days=90),
-    YahooInterval.MONTH_5: timedelta(days=150),
-    YahooInterval.YEAR_1: timedelta(days=365),
-    YahooInterval.YEAR_2: timedelta(days=365*2),
-    YahooInterval.YEAR_5: timedelta(days=365*5),
-    YahooInterval.YEAR_10: timedelta(days=365*10),
-}
-
-
-class YahooLiveFeed(BarLiveFeed):
-    HEADERS = {
-        "User-Agent": "Mozilla/5.0",
-    }
-
-    interval_str: str
-
-    def __init__(self, ticker: str, interval: YahooInterval):
-        super().__init__(ticker, YAHOO_INTERVAL_TO_DELTA[interval])
-        self.interval_str = interval.value
-
-    async def _fetch(self, target: datetime) -> BarEvent:
-        target_timestamp = int(target.timestamp())
-        url = f"https://query1.finance.yahoo.com/v8/finance/chart/{self.ticker}?" + \
-            f"lang=en-US&" + \
-            f"region=US&" + \
-            f"includeAdjustedClose=true&" + \
-            f"interval={self.interval_str}&" + \
-            f"period1={target_timestamp}&" + \
-            f"period2={target_timestamp + 59}&" + \
-            f"events=capitalGain%7Cdiv%7Csplit&" + \
-            f"useYfid=true&" + \
-            f"corsDomain=finance.yahoo.com"
-        response = requests.get(url, headers=self.HEADERS)
-        data = response.json()
-        result = data["chart"]["result"][0]
-        assert "timestamp" in result
-        assert len(result["timestamp"]) == 1
-        timestamp = result["timestamp"][0]
-        quote = result["indicators"]["quote"][0]
-        return BarEvent(
-            timestamp=datetime.fromtimestamp(timestamp).replace(tzinfo=timezone.utc),
-            open=quote["open"],
-            high=quote["high"],
-            low=quote["low"],
-            close=quote["close"],
-            volume=quote["volume"],
-        )
-
-
-def make_feed(ticker: str, interval: YahooInterval):
-    feed = BarFeed()
-    feed.history = CsvBarHistory(f"../data/{ticker}.csv", YAHOO_CSV_COLUMNS)
-    feed.live_feed = YahooLiveFeed(ticker, interval)
-    return feed
+import asyncio
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+import math
+import typing
+
+import aiohttp
+
+from engine.bar.cache import COLUMN_CACHE
+from engine.bar.event import BarEvent
+from engine.bar.feed import BarFeed
+from engine.bar.history import CsvBarHistory, CsvColumnMapping, date_column, float_column
+from engine.bar.live import LIVE_SCHEDULER, BarLiveFeed, LiveScheduler
+from engine.bar.resample import ResampledBarFeed
+
+YAHOO_CSV_COLUMNS = [
+    CsvColumnMapping("Date", lambda x: datetime.strptime(x, "%Y-%m-%d").replace(tzinfo=timezone.utc), "timestamp", date_column),
+    CsvColumnMapping("Open", float, "open", float_column),
+    CsvColumnMapping("High", float, "high", float_column),
+    CsvColumnMapping("Low", float, "low", float_column),
+    CsvColumnMapping("Close", float, "close", float_column),
+    CsvColumnMapping("Volume", float, "volume", float_column),
+]
+
+
+class YahooInterval(Enum):
+    MIN_1 = "1m"
+    MIN_5 = "5m"
+    HOUR_1 = "1h"
+    DAY_1 = "1d"
+    DAY_5 = "5d"
+    MONTH_1 = "1mo"
+    MONTH_3 = "3mo"
+    MONTH_5 = "5mo"
+    YEAR_1 = "1y"
+    YEAR_2 = "2y"
+    YEAR_5 = "5y"
+    YEAR_10 = "10y"
+
+YAHOO_INTERVAL_TO_DELTA = {
+    YahooInterval.MIN_1: timedelta(minutes=1),
+    YahooInterval.MIN_5: timedelta(minutes=5),
+    YahooInterval.HOUR_1: timedelta(hours=1),
+    YahooInterval.DAY_1: timedelta(days=1),
+    YahooInterval.DAY_5: timedelta(days=5),
+    YahooInterval.MONTH_1: timedelta(days=30),
+    YahooInterval.MONTH_3: timedelta(days=90),
+    YahooInterval.MONTH_5: timedelta(days=150),
+    YahooInterval.YEAR_1: timedelta(days=365),
+    YahooInterval.YEAR_2: timedelta(days=365*2),
+    YahooInterval.YEAR_5: timedelta(days=365*5),
+    YahooInterval.YEAR_10: timedelta(days=365*10),
+}
+
+
+class YahooSession:
+    """
+    HTTP client shared by the Yahoo live feeds.
+    All requests go through one pool of keep-alive connections,
+    which also limits how many of them are in flight at once.
+    The session is opened by the first request and closed once its last feed has stopped and is closed.
+    """
+    HEADERS = {
+        "User-Agent": "Mozilla/5.0",
+    }
+    MAX_CONNECTIONS = 64
+    TIMEOUT = aiohttp.ClientTimeout(total=15)
+
+    max_connections: int
+    session: aiohttp.ClientSession|None
+    loop: asyncio.AbstractEventLoop|None
+    users: int
+
+    def __init__(self, max_connections: int = MAX_CONNECTIONS):
+        self.max_connections = max_connections
+        self.session = None
+        self.loop = None
+        self.users = 0
+
+    def acquire(self):
+        self.users += 1
+
+    def release(self):
+        self.users = max(0, self.users - 1)
+
+    async def get_json(self, url: str, params: typing.Dict[str, str]) -> typing.Any:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300)
+            self.session = aiohttp.ClientSession(connector=connector, headers=self.HEADERS, timeout=self.TIMEOUT)
+            self.loop = asyncio.get_running_loop()
+        async with self.session.get(url, params=params) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def aclose(self):
+        """
+        Closes the session if no feed uses it any more, on the loop it was opened on.
+        """
+        if self.users > 0:
+            return
+        session = self.session
+        self.session = None
+        self.loop = None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def close(self):
+        """
+        Closes the session from outside of a running loop.
+        """
+        if self.loop is None or self.loop.is_closed():
+            self.session = None
+            self.loop = None
+            return
+        self.loop.run_until_complete(self.aclose())
+
+
+SHARED_SESSION = YahooSession()
+
+
+def _quote_value(quote: typing.Dict[str, typing.List[float|None]], field: str) -> float:
+    value = quote[field][0]
+    return math.nan if value is None else float(value)
+
+
+class YahooLiveFeed(BarLiveFeed):
+    """
+    Polls the chart API, which serves one ticker per request,
+    so fetch_many() keeps the default of parallel requests over the shared session.
+    """
+    CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/"
+
+    interval_str: str
+    session: YahooSession
+
+    def __init__(self, ticker: str, interval: YahooInterval, session: YahooSession|None = None, scheduler: LiveScheduler|None = None):
+        super().__init__(ticker, YAHOO_INTERVAL_TO_DELTA[interval], scheduler)
+        self.interval_str = interval.value
+        self.session = session or SHARED_SESSION
+
+    def start(self):
+        super().start()
+        self.session.acquire()
+
+    def stop(self):
+        super().stop()
+        self.session.release()
+
+    async def aclose(self):
+        await self.session.aclose()
+
+    async def _fetch(self, target: datetime) -> BarEvent:
+        target_timestamp = int(target.timestamp())
+        params = {
+            "lang": "en-US",
+            "region": "US",
+            "includeAdjustedClose": "true",
+            "interval": self.interval_str,
+            "period1": str(target_timestamp),
+            "period2": str(target_timestamp + 59),
+            "events": "capitalGain|div|split",
+            "useYfid": "true",
+            "corsDomain": "finance.yahoo.com",
+        }
+        data = await self.session.get_json(self.CHART_URL + self.ticker, params)
+        result = data["chart"]["result"][0]
+        assert "timestamp" in result
+        assert len(result["timestamp"]) == 1
+        timestamp = result["timestamp"][0]
+        quote = result["indicators"]["quote"][0]
+        return BarEvent(
+            timestamp=datetime.fromtimestamp(timestamp, timezone.utc),
+            open=_quote_value(quote, "open"),
+            high=_quote_value(quote, "high"),
+            low=_quote_value(quote, "low"),
+            close=_quote_value(quote, "close"),
+            volume=_quote_value(quote, "volume"),
+        )
+
+
+def make_feed(ticker: str, interval: YahooInterval):
+    feed = BarFeed()
+    feed.history = CsvBarHistory(f"../data/{ticker}.csv", YAHOO_CSV_COLUMNS, COLUMN_CACHE)
+    feed.live_feed = YahooLiveFeed(ticker, interval, scheduler=LIVE_SCHEDULER)
+    return feed
+
+
+def make_resampled_feed(ticker: str, interval: timedelta, source_interval: YahooInterval = YahooInterval.MIN_1):
+    source = make_feed(ticker, source_interval)
+    return ResampledBarFeed(source, interval, YAHOO_INTERVAL_TO_DELTA[source_interval])
@@ -1,52 +1,315 @@
-import asyncio
-import typing
-
-import engine.feed
-
-
-class EventAggregator:
-    loop: asyncio.AbstractEventLoop
-    feeds: typing.List[engine.feed.EventFeed]
-    buffer: typing.Dict[engine.feed.EventFeed, engine.feed.Event|None]
-    all_live: bool = False
-
-    def __init__(self, loop: asyncio.AbstractEventLoop|None = None):
-        self.loop = loop or asyncio.get_event_loop()
-        self.feeds = []
-        self.buffer = {}
-
-    def start(self):
-        for feed in self.feeds:
-            feed.start()
-        self.buffer = {feed: None for feed in self.feeds}
-
-    async def next(self) -> engine.feed.Event:
-        if not self.all_live:
-            historical = [feed for feed in self.buffer if not feed.live]
-            if historical:
-                for feed in historical:
-                    if self.buffer[feed] is not None:
-                        continue
-                    event = await feed.next()
-                    self.buffer[feed] = event
-                earliest: engine.feed.Event|None = None
-                for feed in historical:
-                    buffered_event = self.buffer[feed]
-                    if buffered_event is None:
-                        continue
-                    if earliest is None or buffered_event.timestamp < earliest.timestamp:
-                        earliest = buffered_event
-                if earliest:
-                    del self.buffer[earliest.feed]
-                    self.buffer[earliest.feed] = None
-                    return earliest
-                else:
-                    self.all_live = True
-            else:
-                self.all_live = True
-        if self.all_live:
-            raise NotImplementedError()
-
-    def stop(self):
-        for feed in self.feeds:
-            feed.stop()
+import asyncio
+import copy
+import datetime
+import heapq
+import typing
+
+import engine.feed
+
+
+class QueueDelayStats:
+    count: int
+    total: float
+    max: float
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, delay: float):
+        self.count += 1
+        self.total += delay
+        self.max = max(self.max, delay)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class EventAggregator:
+    loop: asyncio.AbstractEventLoop
+    feeds: typing.List[engine.feed.EventFeed]
+    buffer: typing.Dict[engine.feed.EventFeed, engine.feed.Event|None]
+    queue: typing.List[typing.Tuple[int, int, engine.feed.Event]]
+    pending: typing.List[int]
+    skipping: typing.Dict[int, int]
+    all_live: bool = False
+    min_slice_size: int = 32
+    max_lateness: datetime.timedelta = datetime.timedelta(seconds=10)
+    live_feeds: typing.Set[int]
+    live_tasks: typing.Dict[int, asyncio.Task]
+    live_queue: typing.List[typing.Tuple[int, int, float, engine.feed.Event]]
+    watermarks: typing.Dict[int, int]
+    queue_delays: typing.Dict[engine.feed.EventFeed, QueueDelayStats]
+
+    def __init__(self, loop: asyncio.AbstractEventLoop|None = None):
+        self.loop = loop or asyncio.get_event_loop()
+        self.feeds = []
+        self.buffer = {}
+        self.queue = []
+        self.pending = []
+        self.skipping = {}
+        self.live_feeds = set()
+        self.live_tasks = {}
+        self.live_queue = []
+        self.watermarks = {}
+        self.queue_delays = {}
+
+    def start(self):
+        for feed in self.feeds:
+            feed.start()
+        self.buffer = {feed: None for feed in self.feeds}
+        self.queue = []
+        self.pending = list(range(len(self.feeds)))
+        self.skipping = {}
+        self.all_live = False
+        self.live_feeds = set(range(len(self.feeds)))
+        self.live_tasks = {}
+        self.live_queue = []
+        self.watermarks = {}
+        self.queue_delays = {feed: QueueDelayStats() for feed in self.feeds}
+
+    def seek(self, timestamp: datetime.datetime):
+        """
+        Starts every feed at its first event at or after the timestamp.
+        Called after start() and before the first call to next().
+        """
+        ns = engine.feed.datetime_to_ns(timestamp)
+        for index, feed in enumerate(self.feeds):
+            if not feed.seek(timestamp):
+                self.skipping[index] = ns
+
+    def snapshot(self) -> typing.Dict[str, typing.Any]|None:
+        """
+        Captures the merge state of a historical replay as picklable data:
+        the read position of every feed and the events read ahead of the last one returned.
+        Returns None once live, or if a feed cannot report its position.
+        """
+        if self.all_live:
+            return None
+        positions = []
+        for feed in self.feeds:
+            if feed.live:
+                return None
+            position = None if feed.history_ended else feed.position()
+            if position is None and not feed.history_ended:
+                return None
+            positions.append((feed.history_ended, position))
+        queue = []
+        for ns, index, event in self.queue:
+            # buffered events are stored without their feed, restore() reattaches it
+            event = copy.copy(event)
+            event.feed = None
+            queue.append((ns, index, event))
+        return {
+            "positions": positions,
+            "queue": queue,
+            "pending": list(self.pending),
+            "skipping": dict(self.skipping),
+        }
+
+    def restore(self, snapshot: typing.Dict[str, typing.Any]):
+        """
+        Continues a replay from a snapshot().
+        Called after start() instead of seek().
+        """
+        for feed, (ended, position) in zip(self.feeds, snapshot["positions"]):
+            if ended:
+                feed.history_ended = True
+            elif not feed.restore(position):
+                raise ValueError(f"{type(feed).__name__} cannot be restored")
+        self.queue = []
+        for ns, index, event in snapshot["queue"]:
+            feed = self.feeds[index]
+            event.feed = feed
+            self.buffer[feed] = event
+            self.queue.append((ns, index, event))
+        heapq.heapify(self.queue)
+        self.pending = list(snapshot["pending"])
+        self.skipping = dict(snapshot["skipping"])
+
+    def _skip(self, index: int, event: engine.feed.Event|None) -> engine.feed.Event|None:
+        # fallback for feeds that cannot seek, their old events are read and dropped
+        feed = self.feeds[index]
+        ns = self.skipping.pop(index)
+        while event is not None:
+            if isinstance(event, engine.feed.EventBatch):
+                _, event = event.split(ns, inclusive=False)
+                if event is not None:
+                    return event
+            elif event.ns >= ns:
+                return event
+            event = feed.next_historical()
+        return None
+
+    def _refill_historical(self, index: int):
+        feed = self.feeds[index]
+        if feed.live:
+            return
+        event = feed.next_historical()
+        if self.skipping and index in self.skipping:
+            event = self._skip(index, event)
+        if event is None:
+            return
+        self.buffer[feed] = event
+        # the feed index breaks timestamp ties, so the merge is stable
+        # and never has to compare the events themselves
+        heapq.heappush(self.queue, (event.ns, index, event))
+
+    def _pop(self) -> engine.feed.Event:
+        _, index, earliest = heapq.heappop(self.queue)
+        if isinstance(earliest, engine.feed.EventBatch) and self.queue:
+            # a batch is only released up to the next event of another feed,
+            # the rest of it goes back into the queue
+            next_ns, next_index, _ = self.queue[0]
+            head, tail = earliest.split(next_ns, inclusive=index < next_index)
+            if tail is not None:
+                if len(head) < self.min_slice_size:
+                    # interleaved feeds would be cut into slices of a few events,
+                    # so their batches are merged into one block instead
+                    merged = self._merge(index, earliest)
+                    if merged is not None:
+                        return merged
+                self.buffer[earliest.feed] = tail
+                heapq.heappush(self.queue, (tail.ns, index, tail))
+                return head
+        self.buffer[earliest.feed] = None
+        self.pending.append(index)
+        return earliest
+
+    def _merge(self, index: int, earliest: engine.feed.EventBatch) -> engine.feed.EventBatch|None:
+        """
+        Merges the events of all buffered batches of the same type as the earliest one
+        that come before the horizon, the first timestamp any feed may still have unread events at.
+        Returns None if there is nothing to merge, the queue is then left as it was.
+        """
+        kind = type(earliest)
+        entries = [(earliest.ns, index, earliest)]
+        others = []
+        horizon = earliest.last_ns
+        for entry in self.queue:
+            event = entry[2]
+            if type(event) is kind:
+                entries.append(entry)
+                horizon = min(horizon, event.last_ns)
+            else:
+                others.append(entry)
+                horizon = min(horizon, entry[0])
+        # parts in feed order, so equal timestamps keep the order of the heap
+        entries.sort(key=lambda entry: entry[1])
+        heads = []
+        tails = []
+        for _, feed_index, batch in entries:
+            head, tail = batch.split(horizon, inclusive=False)
+            if head is not None:
+                heads.append(head)
+            if tail is not None:
+                tails.append((tail.ns, feed_index, tail))
+        if len(heads) < 2:
+            return None
+        merged = kind.merge(heads)
+        if merged is None:
+            return None
+        for _, feed_index, batch in entries:
+            self.buffer[batch.feed] = None
+        for entry in tails:
+            self.buffer[entry[2].feed] = entry[2]
+        consumed = {feed_index for _, feed_index, _ in entries} - {feed_index for _, feed_index, _ in tails}
+        self.pending.extend(sorted(consumed))
+        self.queue = others + tails
+        heapq.heapify(self.queue)
+        return merged
+
+    def next_historical(self) -> engine.feed.Event|None:
+        """
+        Synchronous fast path of next() while the feeds replay history.
+        Returns None once every history has ended and next() has to be awaited.
+        """
+        if self.all_live:
+            return None
+        pending = self.pending
+        while pending:
+            # feeds whose history ended just leave the merge,
+            # they are picked up again by the live merge
+            self._refill_historical(pending.pop())
+        if not self.queue:
+            return None
+        return self._pop()
+
+    def _watermark(self, index: int) -> int|None:
+        watermark = self.watermarks.get(index)
+        if watermark is not None:
+            return watermark
+        feed = self.feeds[index]
+        if feed.live:
+            # nothing received yet, but live events are never older than live_since
+            return engine.feed.datetime_to_ns(feed.live_since) - 1
+        return None
+
+    def _can_release(self, ns: int, index: int) -> bool:
+        for other in self.live_feeds:
+            if other == index:
+                continue
+            watermark = self._watermark(other)
+            if watermark is None or watermark < ns:
+                return False
+        return True
+
+    def _release(self) -> engine.feed.Event:
+        _, _, arrival, event = heapq.heappop(self.live_queue)
+        self.buffer[event.feed] = None
+        self.queue_delays[event.feed].add(self.loop.time() - arrival)
+        return event
+
+    def _receive(self, index: int, task: asyncio.Task):
+        del self.live_tasks[index]
+        event = task.result()
+        if event is None:
+            self.live_feeds.discard(index)
+            self.watermarks.pop(index, None)
+            return
+        self.buffer[event.feed] = event
+        self.watermarks[index] = event.ns
+        heapq.heappush(self.live_queue, (event.ns, index, self.loop.time(), event))
+
+    async def _live_next(self) -> engine.feed.Event|None:
+        max_lateness = self.max_lateness.total_seconds()
+        while True:
+            for index in self.live_feeds:
+                if index not in self.live_tasks:
+                    self.live_tasks[index] = self.loop.create_task(self.feeds[index].next())
+            timeout = None
+            if self.live_queue:
+                ns, index, arrival, _ = self.live_queue[0]
+                # an event is released once every other feed has caught up with it,
+                # or once it has waited for too long
+                waited = self.loop.time() - arrival
+                if waited >= max_lateness or self._can_release(ns, index):
+                    return self._release()
+                timeout = max_lateness - waited
+            if not self.live_tasks:
+                return None
+            await asyncio.wait(self.live_tasks.values(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for index, task in list(self.live_tasks.items()):
+                if task.done():
+                    self._receive(index, task)
+
+    async def next(self) -> engine.feed.Event|None:
+        if not self.all_live:
+            event = self.next_historical()
+            if event is not None:
+                return event
+            self.all_live = True
+        return await self._live_next()
+
+    def stop(self):
+        for task in self.live_tasks.values():
+            task.cancel()
+        self.live_tasks = {}
+        for feed in self.feeds:
+            feed.stop()
+
+    async def aclose(self):
+        for feed in self.feeds:
+            await feed.aclose()
@@ -1,48 +1,163 @@
-import asyncio
-import datetime
-
-import engine.data
-import engine.feed
-
-
-class Engine:
-    loop: asyncio.AbstractEventLoop
-    start_timestamp: datetime.datetime|None = None
-    end_timestamp: datetime.datetime|None = None
-    aggregator: engine.data.EventAggregator
-
-    def __init__(self, loop: asyncio.AbstractEventLoop|None = None):
-        self.loop = loop or asyncio.get_event_loop()
-
-    def run(self):
-        self.aggregator.start()
-        self._loop()
-        self.aggregator.stop()
-
-    def _loop(self):
-        if self.start_timestamp is not None:
-            pending_event: engine.feed.Event|None = None
-            while True:
-                future = self.aggregator.next()
-                event = self.loop.run_until_complete(future)
-                if event is None:
-                    break
-                if event.timestamp < self.start_timestamp:
-                    continue
-                pending_event = event
-                break
-            if pending_event:
-                if self.end_timestamp is None or pending_event.timestamp >= self.end_timestamp:
-                    return
-                self.process(pending_event)
-        while True:
-            future = self.aggregator.next()
-            event = self.loop.run_until_complete(future)
-            if event is None:
-                break
-            if self.end_timestamp is not None and event.timestamp >= self.end_timestamp:
-                break
-            self.process(event)
-
-    def process(self, event: engine.feed.Event):
-        print(event.timestamp, type(event.feed).__name__, type(event).__name__)
+import asyncio
+import datetime
+import os
+import pickle
+import typing
+
+import engine.data
+import engine.feed
+import engine.profiler
+
+
+class Engine:
+    loop: asyncio.AbstractEventLoop
+    start_timestamp: datetime.datetime|None = None
+    end_timestamp: datetime.datetime|None = None
+    aggregator: engine.data.EventAggregator
+    batch_events: bool = False
+    profiler: engine.profiler.Profiler|None = None
+    checkpoint_path: str|None = None
+    checkpoint_interval: int = 1000000
+    resume: bool = False
+    processed: int = 0
+
+    def __init__(self, loop: asyncio.AbstractEventLoop|None = None):
+        self.loop = loop or asyncio.get_event_loop()
+
+    def run(self):
+        self.loop.run_until_complete(self.run_async())
+
+    async def run_async(self):
+        if self.profiler is not None:
+            self.profiler.attach(self.aggregator)
+            self.profiler.start()
+        self.aggregator.start()
+        self.processed = 0
+        if not self._try_resume() and self.start_timestamp is not None:
+            self.aggregator.seek(self.start_timestamp)
+        await self._loop()
+        self.aggregator.stop()
+        await self.aggregator.aclose()
+        if self.profiler is not None:
+            self.profiler.stop()
+
+    def checkpoint(self) -> bool:
+        """
+        Writes the replay state and the strategy state() to checkpoint_path.
+        The file is replaced atomically, so a crash leaves the previous checkpoint intact.
+        Returns False if there is nothing to checkpoint (live data, feeds that cannot report a position).
+        """
+        snapshot = self.aggregator.snapshot()
+        if snapshot is None:
+            return False
+        data = {
+            "processed": self.processed,
+            "aggregator": snapshot,
+            "state": self.state(),
+        }
+        temporary = self.checkpoint_path + ".tmp"
+        with open(temporary, "wb") as fh:
+            pickle.dump(data, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, self.checkpoint_path)
+        return True
+
+    def _try_resume(self) -> bool:
+        if not self.resume or self.checkpoint_path is None or not os.path.exists(self.checkpoint_path):
+            return False
+        with open(self.checkpoint_path, "rb") as fh:
+            data = pickle.load(fh)
+        # feeds continue from their stored positions, nothing is replayed
+        self.aggregator.restore(data["aggregator"])
+        self.processed = data["processed"]
+        self.restore_state(data["state"])
+        return True
+
+    def state(self) -> typing.Any:
+        """
+        Returns the strategy state to store with a checkpoint.
+        Must be picklable.
+        """
+        return None
+
+    def restore_state(self, state: typing.Any):
+        """
+        Restores the strategy state of a checkpoint, before the run continues.
+        """
+        pass
+
+    async def _loop(self):
+        aggregator = self.aggregator
+        profiler = self.profiler
+        start_ns = None if self.start_timestamp is None else engine.feed.datetime_to_ns(self.start_timestamp)
+        end_ns = None if self.end_timestamp is None else engine.feed.datetime_to_ns(self.end_timestamp)
+        next_checkpoint = None
+        if self.checkpoint_path is not None:
+            next_checkpoint = self.processed + self.checkpoint_interval
+        while True:
+            # historical events come without a coroutine per event,
+            # the aggregator is only awaited once live data is involved
+            if profiler is None:
+                event = aggregator.next_historical()
+            else:
+                event = profiler.time_merge(aggregator.next_historical)
+            if event is None:
+                event = await aggregator.next()
+                if event is None:
+                    break
+            if isinstance(event, engine.feed.EventBatch):
+                if start_ns is not None:
+                    _, event = event.split(start_ns, inclusive=False)
+                    if event is None:
+                        continue
+                    start_ns = None
+                ended = False
+                if end_ns is not None:
+                    event, rest = event.split(end_ns, inclusive=False)
+                    ended = rest is not None
+                if event is not None:
+                    self._process_batch(event)
+                    self.processed += len(event)
+                if ended:
+                    break
+                if next_checkpoint is not None and self.processed >= next_checkpoint:
+                    self.checkpoint()
+                    next_checkpoint = self.processed + self.checkpoint_interval
+                continue
+            if start_ns is not None:
+                if event.ns < start_ns:
+                    continue
+                start_ns = None
+            if end_ns is not None and event.ns >= end_ns:
+                break
+            if profiler is None:
+                self.process(event)
+            else:
+                profiler.time_process(self.process, event)
+            self.processed += 1
+            if next_checkpoint is not None and self.processed >= next_checkpoint:
+                self.checkpoint()
+                next_checkpoint = self.processed + self.checkpoint_interval
+
+    def _process_batch(self, batch: engine.feed.EventBatch):
+        profiler = self.profiler
+        if self.batch_events:
+            if profiler is None:
+                self.process(batch)
+            else:
+                profiler.time_process(self.process, batch)
+            return
+        for event in batch:
+            if profiler is None:
+                self.process(event)
+            else:
+                profiler.time_process(self.process, event)
+
+    def result(self) -> typing.Any:
+        """
+        Returns the outcome of the run.
+        Used by the parallel runner to send results back to the parent process.
+        """
+        return None
+
+    def process(self, event: engine.feed.Event):
+        print(event.timestamp, type(event.feed).__name__, type(event).__name__)
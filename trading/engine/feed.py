@@ -1,64 +1,192 @@
-import datetime
-import typing
-
-
-class Event:
-    feed: "EventFeed" = None
-    timestamp: datetime.datetime
-
-    def __init__(self, timestamp: datetime.datetime):
-        self.timestamp = timestamp
-
-T = typing.TypeVar('T', bound=Event)
-
-
-class EventFeed(typing.Generic[T]):
-    live_since: datetime.datetime|None = None
-
-    @property
-    def live(self):
-        return self.live_since is not None
-
-    def start(self):
-        """
-        Starts the feed.
-        Called once before the first call to next().
-        """
-        pass
-
-    async def next(self) -> T:
-        if not self.live:
-            result = self._historical_next()
-            if result is not None:
-                assert result.feed is None
-                result.feed = self
-                return result
-            self.live_since = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc)
-            self.start_live()
-        result = await self._live_next()
-        assert result.feed is None
-        assert result.timestamp >= self.live_since
-        result.feed = self
-        return result
-    
-    def stop(self):
-        """
-        Stops the feed.
-        Called once after the last call to next().
-        Note that start_live() may be called before this, but not after.
-        """
-        pass
-    
-    def start_live(self):
-        """
-        Starts the live feed.
-        Called once before the first call to _live_next().
-        May not be called if backtesting.
-        """
-        pass
-
-    def _historical_next(self) -> T|None:
-        raise NotImplementedError()
-    
-    async def _live_next(self) -> T|None:
-        raise NotImplementedError()
+import datetime
+import time
+import typing
+
+import engine.profiler
+
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+MICROSECOND = datetime.timedelta(microseconds=1)
+
+
+def datetime_to_ns(timestamp: datetime.datetime) -> int:
+    return (timestamp - EPOCH) // MICROSECOND * 1000
+
+
+def ns_to_datetime(ns: int) -> datetime.datetime:
+    return EPOCH + datetime.timedelta(microseconds=int(ns) // 1000)
+
+
+class Event:
+    """
+    Events are ordered by ns, their timestamp in epoch nanoseconds.
+    The datetime is only built when timestamp is accessed.
+    """
+    __slots__ = ("feed", "ns", "_timestamp")
+    feed: "EventFeed|None"
+    ns: int
+    _timestamp: datetime.datetime|None
+
+    def __init__(self, timestamp: datetime.datetime|int):
+        self.feed = None
+        self.timestamp = timestamp
+
+    @property
+    def timestamp(self) -> datetime.datetime:
+        if self._timestamp is None:
+            self._timestamp = ns_to_datetime(self.ns)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: datetime.datetime|int):
+        if isinstance(timestamp, datetime.datetime):
+            self.ns = datetime_to_ns(timestamp)
+            self._timestamp = timestamp
+        else:
+            self.ns = timestamp
+            self._timestamp = None
+
+
+class EventBatch(Event):
+    """
+    A block of consecutive events from one feed, stored as a whole.
+    The timestamp of the batch is the timestamp of its first event.
+    """
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    def __iter__(self) -> typing.Iterator[Event]:
+        raise NotImplementedError()
+
+    @property
+    def last_ns(self) -> int:
+        """
+        The timestamp of the last event, in epoch nanoseconds.
+        """
+        raise NotImplementedError()
+
+    @classmethod
+    def merge(cls, parts: typing.List["EventBatch"]) -> "EventBatch|None":
+        """
+        Interleaves batches of different feeds into one batch in timestamp order,
+        events with equal timestamps in the order of the parts.
+        Returns None if batches of this type cannot be merged.
+        """
+        return None
+
+    def split(self, ns: int, inclusive: bool) -> typing.Tuple["EventBatch|None", "EventBatch|None"]:
+        """
+        Splits the batch into the events before the timestamp (in epoch nanoseconds) and the rest.
+        Events at exactly the timestamp go to the first part if inclusive.
+        Empty parts are returned as None.
+        """
+        raise NotImplementedError()
+
+T = typing.TypeVar('T', bound=Event)
+
+
+class EventFeed(typing.Generic[T]):
+    live_since: datetime.datetime|None = None
+    history_ended: bool = False
+    profiler: engine.profiler.Profiler|None = None
+
+    @property
+    def live(self):
+        return self.live_since is not None
+
+    def start(self):
+        """
+        Starts the feed.
+        Called once before the first call to next().
+        """
+        pass
+
+    def seek(self, timestamp: datetime.datetime) -> bool:
+        """
+        Skips the history to the first event at or after the timestamp.
+        Called after start() and before the first call to next().
+        Returns False if the feed cannot seek,
+        the caller then has to skip the older events itself.
+        """
+        return False
+
+    def position(self) -> typing.Any:
+        """
+        Returns the read position of the history as a picklable value,
+        such that restore() continues right after the last event returned.
+        Returns None if the feed cannot be checkpointed.
+        """
+        return None
+
+    def restore(self, position: typing.Any) -> bool:
+        """
+        Continues the history from a position returned by position().
+        Called after start() instead of seek().
+        Returns False if the feed cannot be restored.
+        """
+        return False
+
+    def next_historical(self) -> T|None:
+        """
+        Synchronous counterpart of next() that only replays history.
+        Returns None once the history has ended, without going live.
+        """
+        if self.history_ended:
+            return None
+        if self.profiler is None:
+            result = self._historical_next()
+        else:
+            start = time.perf_counter()
+            result = self._historical_next()
+            self.profiler.add_decode(self, time.perf_counter() - start)
+        if result is None:
+            self.history_ended = True
+            return None
+        assert result.feed is None
+        result.feed = self
+        return result
+
+    async def next(self) -> T:
+        if not self.live:
+            result = self.next_historical()
+            if result is not None:
+                return result
+            self.live_since = datetime.datetime.utcnow().replace(tzinfo=datetime.timezone.utc)
+            self.start_live()
+        result = await self._live_next()
+        if result is None:
+            return None
+        assert result.feed is None
+        assert result.timestamp >= self.live_since
+        result.feed = self
+        return result
+    
+    def stop(self):
+        """
+        Stops the feed.
+        Called once after the last call to next().
+        Note that start_live() may be called before this, but not after.
+        """
+        pass
+
+    async def aclose(self):
+        """
+        Releases resources bound to the event loop, such as network sessions.
+        Awaited on the loop of the run, once after stop().
+        """
+        pass
+    
+    def start_live(self):
+        """
+        Starts the live feed.
+        Called once before the first call to _live_next().
+        May not be called if backtesting.
+        """
+        pass
+
+    def _historical_next(self) -> T|None:
+        raise NotImplementedError()
+    
+    async def _live_next(self) -> T|None:
+        raise NotImplementedError()
@@ -0,0 +1,175 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import gc
+from multiprocessing import util
+from multiprocessing.shared_memory import SharedMemory
+import sys
+import time
+import typing
+
+import numpy
+
+from engine.bar.event import BarBatch
+from engine.bar.history import BarHistory, BatchBarHistory
+from engine.engine import Engine
+
+BAR_COLUMNS = ("timestamps", "open", "high", "low", "close", "volume")
+BAR_COLUMN_TYPES = (numpy.int64, numpy.float64, numpy.float64, numpy.float64, numpy.float64, numpy.float64)
+COLUMN_ITEM_SIZE = 8
+
+
+class SharedBarsInfo:
+    """
+    Picklable description of bars published in shared memory.
+    """
+    name: str
+    count: int
+
+    def __init__(self, name: str, count: int):
+        self.name = name
+        self.count = count
+
+
+def _columns_of(buffer, count: int) -> typing.List[numpy.ndarray]:
+    return [
+        numpy.ndarray((count,), dtype=dtype, buffer=buffer, offset=i * count * COLUMN_ITEM_SIZE)
+        for i, dtype in enumerate(BAR_COLUMN_TYPES)
+    ]
+
+
+def publish_bars(batch: BarBatch) -> typing.Tuple[SharedMemory, SharedBarsInfo]:
+    count = len(batch)
+    memory = SharedMemory(create=True, size=count * COLUMN_ITEM_SIZE * len(BAR_COLUMNS))
+    for column, target in zip(BAR_COLUMNS, _columns_of(memory.buf, count)):
+        target[:] = getattr(batch, column)
+    return memory, SharedBarsInfo(memory.name, count)
+
+
+def attach_bars(info: SharedBarsInfo) -> typing.Tuple[SharedMemory, BarBatch]:
+    memory = SharedMemory(name=info.name)
+    columns = _columns_of(memory.buf, info.count)
+    for column in columns:
+        column.flags.writeable = False
+    return memory, BarBatch(*columns)
+
+
+# bars attached by this worker process, by key
+_attached: typing.Dict[str, typing.Tuple[SharedMemory, BarBatch]] = {}
+
+
+def shared_history(key: str) -> BatchBarHistory:
+    """
+    Returns a history over bars shared by the parent process.
+    Only valid inside the job factories of a ParallelRunner.
+    """
+    _, batch = _attached[key]
+    return BatchBarHistory(batch)
+
+
+def _init_worker(shared: typing.Dict[str, SharedBarsInfo]):
+    for key, info in shared.items():
+        _attached[key] = attach_bars(info)
+    # pool workers leave through os._exit, which skips atexit but runs multiprocessing finalizers
+    util.Finalize(None, _detach_worker, exitpriority=10)
+
+
+def _detach_worker():
+    """
+    Closes the segments attached by this worker, so the parent can unlink them cleanly.
+    """
+    memories = [memory for memory, _ in _attached.values()]
+    # arrays over a segment have to be gone before it can be closed
+    _attached.clear()
+    gc.collect()
+    for memory in memories:
+        try:
+            memory.close()
+        except BufferError:
+            # still referenced from a job, the process exit releases it
+            pass
+
+
+class BacktestJob:
+    """
+    One independent backtest.
+    The factory builds the Engine from the parameters inside the worker process,
+    so it has to be a module-level function that the worker can import.
+    """
+    name: str
+    factory: typing.Callable[..., Engine]
+    params: typing.Dict[str, typing.Any]
+
+    def __init__(self, name: str, factory: typing.Callable[..., Engine], params: typing.Dict[str, typing.Any]|None = None):
+        self.name = name
+        self.factory = factory
+        self.params = params or {}
+
+
+class BacktestResult:
+    name: str
+    params: typing.Dict[str, typing.Any]
+    result: typing.Any
+    setup_time: float
+    run_time: float
+
+    def __init__(self, name: str, params: typing.Dict[str, typing.Any], result: typing.Any, setup_time: float, run_time: float):
+        self.name = name
+        self.params = params
+        self.result = result
+        self.setup_time = setup_time
+        self.run_time = run_time
+
+    def __repr__(self):
+        return f"BacktestResult({self.name}, {self.params}, setup {self.setup_time:.3f}s, run {self.run_time:.3f}s)"
+
+
+def _run_job(job: BacktestJob) -> BacktestResult:
+    start = time.perf_counter()
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    engine = job.factory(**job.params)
+    setup_time = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.run()
+    run_time = time.perf_counter() - start
+    loop.close()
+    return BacktestResult(job.name, job.params, engine.result(), setup_time, run_time)
+
+
+class ParallelRunner:
+    """
+    Runs independent backtests (symbol groups or parameter sets) across a process pool.
+    Bars shared through share() are parsed once by the parent
+    and read by every worker from shared memory.
+    Histories over the collect.bar store are memory-mapped
+    and can simply be opened by the workers themselves.
+    """
+    processes: int|None
+    shared: typing.Dict[str, SharedBarsInfo]
+    memory: typing.List[SharedMemory]
+
+    def __init__(self, processes: int|None = None):
+        self.processes = processes
+        self.shared = {}
+        self.memory = []
+
+    def share(self, key: str, history: BarHistory):
+        history.start()
+        batch = history.next_batch(sys.maxsize)
+        history.stop()
+        if batch is None:
+            raise ValueError(f"History for {key} has no bars")
+        memory, info = publish_bars(batch)
+        self.memory.append(memory)
+        self.shared[key] = info
+
+    def run(self, jobs: typing.List[BacktestJob]) -> typing.List[BacktestResult]:
+        with ProcessPoolExecutor(self.processes, initializer=_init_worker, initargs=(self.shared,)) as pool:
+            return list(pool.map(_run_job, jobs))
+
+    def close(self):
+        for memory in self.memory:
+            memory.close()
+            memory.unlink()
+        self.memory = []
+        self.shared = {}
@@ -0,0 +1,168 @@
+import json
+import time
+import typing
+
+HISTOGRAM_BUCKETS = 64
+
+
+class Timing:
+    count: int
+    total: float
+    max: float
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float, count: int = 1):
+        self.count += count
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def summary(self) -> typing.Dict[str, float]:
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+        }
+
+
+class LatencyHistogram(Timing):
+    """
+    Latencies in power of two nanosecond buckets,
+    percentiles are reported as the upper bound of their bucket.
+    """
+    buckets: typing.List[int]
+
+    def __init__(self):
+        super().__init__()
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def add(self, seconds: float, count: int = 1):
+        super().add(seconds, count)
+        self.buckets[min(int(seconds * 1e9).bit_length(), HISTOGRAM_BUCKETS - 1)] += count
+
+    def percentile(self, fraction: float) -> float:
+        target = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= target:
+                return (1 << bucket) / 1e9
+        return 0.0
+
+    def summary(self) -> typing.Dict[str, typing.Any]:
+        result = super().summary()
+        result["p50_seconds"] = self.percentile(0.5)
+        result["p90_seconds"] = self.percentile(0.9)
+        result["p99_seconds"] = self.percentile(0.99)
+        result["histogram_ns"] = {f"<{1 << bucket}": count for bucket, count in enumerate(self.buckets) if count}
+        return result
+
+
+class Profiler:
+    """
+    Collects where the time of an Engine run goes.
+    Set it as the profiler of an Engine, which attaches it to the aggregator,
+    its feeds and their bar histories when the run starts.
+    Every instrumented spot checks for a profiler first,
+    so without one the only cost is that check.
+
+    Recorded are the decode time of each feed (time spent producing its events, including history loading),
+    the bulk load time of each bar history, the merge time of the aggregator
+    (excluding the decoding it triggers), and handler latencies and counts per event type.
+    """
+    feed_names: typing.Dict[typing.Any, str]
+    decode: typing.Dict[typing.Any, Timing]
+    loads: typing.Dict[str, Timing]
+    merge: Timing
+    handlers: typing.Dict[str, LatencyHistogram]
+    aggregator: typing.Any
+    started: float|None
+    elapsed: float
+
+    def __init__(self):
+        self.feed_names = {}
+        self.decode = {}
+        self.loads = {}
+        self.merge = Timing()
+        self.handlers = {}
+        self.aggregator = None
+        self.started = None
+        self.elapsed = 0.0
+
+    def attach(self, aggregator):
+        self.aggregator = aggregator
+        for index, feed in enumerate(aggregator.feeds):
+            self.feed_names[feed] = f"{index}:{type(feed).__name__}"
+            feed.profiler = self
+            history = getattr(feed, "history", None)
+            if history is not None:
+                history.profiler = self
+
+    def start(self):
+        self.started = time.perf_counter()
+
+    def stop(self):
+        if self.started is not None:
+            self.elapsed += time.perf_counter() - self.started
+            self.started = None
+
+    def add_decode(self, feed, seconds: float):
+        timing = self.decode.get(feed)
+        if timing is None:
+            timing = self.decode[feed] = Timing()
+        timing.add(seconds)
+
+    def add_load(self, name: str, seconds: float, rows: int):
+        timing = self.loads.get(name)
+        if timing is None:
+            timing = self.loads[name] = Timing()
+        timing.add(seconds, rows)
+
+    def time_merge(self, next_event: typing.Callable[[], typing.Any]) -> typing.Any:
+        start = time.perf_counter()
+        event = next_event()
+        self.merge.add(time.perf_counter() - start)
+        return event
+
+    def time_process(self, process: typing.Callable[[typing.Any], None], event):
+        start = time.perf_counter()
+        process(event)
+        elapsed = time.perf_counter() - start
+        name = type(event).__name__
+        histogram = self.handlers.get(name)
+        if histogram is None:
+            histogram = self.handlers[name] = LatencyHistogram()
+        histogram.add(elapsed)
+
+    def summary(self) -> typing.Dict[str, typing.Any]:
+        decode_total = sum(timing.total for timing in self.decode.values())
+        merge = self.merge.summary()
+        # the merge pulls events from the feeds, their decoding is reported on its own
+        merge["exclusive_seconds"] = max(0.0, self.merge.total - decode_total)
+        queue_delays = {}
+        if self.aggregator is not None:
+            for feed, stats in self.aggregator.queue_delays.items():
+                if stats.count:
+                    queue_delays[self.feed_names.get(feed, type(feed).__name__)] = {
+                        "count": stats.count,
+                        "mean_seconds": stats.mean,
+                        "max_seconds": stats.max,
+                    }
+        return {
+            "elapsed_seconds": self.elapsed,
+            "decode": {self.feed_names.get(feed, type(feed).__name__): timing.summary() for feed, timing in self.decode.items()},
+            "history_loads": {name: timing.summary() for name, timing in self.loads.items()},
+            "merge": merge,
+            "handlers": {name: histogram.summary() for name, histogram in self.handlers.items()},
+            "events": {name: histogram.count for name, histogram in self.handlers.items()},
+            "live_queue_delays": queue_delays,
+        }
+
+    def export(self, path: str):
+        with open(path, "wt", encoding="utf-8") as fh:
+            json.dump(self.summary(), fh, indent=2)
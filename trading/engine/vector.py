@@ -0,0 +1,197 @@
+import datetime
+import math
+import typing
+
+import numpy
+
+from engine.bar.event import BarBatch
+from engine.feed import EventFeed, datetime_to_ns
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+LOAD_BLOCK_SIZE = 1 << 16
+
+
+def load_bars(feed: EventFeed, start_timestamp: datetime.datetime|None = None, end_timestamp: datetime.datetime|None = None) -> BarBatch|None:
+    """
+    Reads the whole history of a bar feed (BarFeed, ResampledBarFeed) into one batch,
+    through the same start/seek/next_historical path the event engine uses,
+    so indicators attached to the feed come along.
+    The feed is switched to batches and is used up, like after an Engine run.
+    """
+    feed.batch_size = LOAD_BLOCK_SIZE
+    feed.start()
+    if start_timestamp is not None:
+        feed.seek(start_timestamp)
+    batches = []
+    while True:
+        event = feed.next_historical()
+        if event is None:
+            break
+        batches.append(event if isinstance(event, BarBatch) else BarBatch.from_bars([event]))
+    feed.stop()
+    if not batches:
+        return None
+    indicators = None
+    if batches[0].indicators is not None:
+        indicators = {name: numpy.concatenate([batch.indicators[name] for batch in batches]) for name in batches[0].indicators}
+    batch = BarBatch(
+        timestamps=numpy.concatenate([batch.timestamps for batch in batches]),
+        open=numpy.concatenate([batch.open for batch in batches]),
+        high=numpy.concatenate([batch.high for batch in batches]),
+        low=numpy.concatenate([batch.low for batch in batches]),
+        close=numpy.concatenate([batch.close for batch in batches]),
+        volume=numpy.concatenate([batch.volume for batch in batches]),
+        indicators=indicators,
+    )
+    start_ns = None if start_timestamp is None else datetime_to_ns(start_timestamp)
+    end_ns = None if end_timestamp is None else datetime_to_ns(end_timestamp)
+    if start_ns is not None:
+        # feeds that cannot seek still start at the beginning
+        _, batch = batch.split(start_ns, inclusive=False)
+    if batch is not None and end_ns is not None:
+        batch, _ = batch.split(end_ns, inclusive=False)
+    return batch
+
+
+def forward_fill(matrix: numpy.ndarray) -> numpy.ndarray:
+    """
+    Carries the last value of each column forward over its NaN gaps.
+    """
+    valid = ~numpy.isnan(matrix)
+    index = numpy.where(valid, numpy.arange(len(matrix))[:, None], 0)
+    numpy.maximum.accumulate(index, axis=0, out=index)
+    result = matrix[index, numpy.arange(matrix.shape[1])]
+    # before its first value a column stays NaN
+    result[~numpy.maximum.accumulate(valid, axis=0)] = math.nan
+    return result
+
+
+class BarMatrix:
+    """
+    Bars of several symbols aligned on the union of their timestamps.
+    Every field is a (time, symbol) matrix, with NaN where a symbol has no bar.
+    """
+    symbols: typing.List[str]
+    timestamps: numpy.ndarray
+    open: numpy.ndarray
+    high: numpy.ndarray
+    low: numpy.ndarray
+    close: numpy.ndarray
+    volume: numpy.ndarray
+    indicators: typing.Dict[str, numpy.ndarray]
+
+    def __init__(self, bars: typing.Dict[str, BarBatch]):
+        self.symbols = list(bars)
+        batches = list(bars.values())
+        self.timestamps = numpy.unique(numpy.concatenate([batch.timestamps for batch in batches])) if batches else numpy.empty(0, dtype=numpy.int64)
+        rows = [numpy.searchsorted(self.timestamps, batch.timestamps) for batch in batches]
+        shape = (len(self.timestamps), len(batches))
+        for field in BAR_FIELDS:
+            matrix = numpy.full(shape, math.nan)
+            for column, (batch, row) in enumerate(zip(batches, rows)):
+                matrix[row, column] = getattr(batch, field)
+            setattr(self, field, matrix)
+        # indicators are only aligned when every symbol has them
+        self.indicators = {}
+        names = [set(batch.indicators or ()) for batch in batches]
+        for name in set.intersection(*names) if names else ():
+            matrix = numpy.full(shape, math.nan)
+            for column, (batch, row) in enumerate(zip(batches, rows)):
+                matrix[row, column] = batch.indicators[name]
+            self.indicators[name] = matrix
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def filled(self, field: str = "close") -> numpy.ndarray:
+        """
+        The field carried forward over the gaps of each symbol.
+        """
+        return forward_fill(getattr(self, field))
+
+    def returns(self) -> numpy.ndarray:
+        """
+        Close to close returns, zero where there is no price yet.
+        """
+        close = self.filled("close")
+        result = numpy.zeros_like(close)
+        result[1:] = close[1:] / close[:-1] - 1.0
+        return numpy.nan_to_num(result, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+class VectorResult:
+    """
+    Positions are fractions of equity per symbol, held from the close of their bar to the next close.
+    """
+    matrix: BarMatrix
+    positions: numpy.ndarray
+    returns: numpy.ndarray
+    costs: numpy.ndarray
+    pnl: numpy.ndarray
+    equity: numpy.ndarray
+
+    def __init__(self, matrix: BarMatrix, positions: numpy.ndarray, cost: float):
+        self.matrix = matrix
+        self.positions = positions
+        asset_returns = matrix.returns()
+        held = numpy.zeros_like(positions)
+        held[1:] = positions[:-1]
+        self.returns = held * asset_returns
+        turnover = numpy.abs(numpy.diff(positions, axis=0, prepend=0.0)).sum(axis=1)
+        self.costs = turnover * cost
+        self.pnl = self.returns.sum(axis=1) - self.costs
+        self.equity = numpy.cumprod(1.0 + self.pnl)
+
+    def summary(self) -> typing.Dict[str, float]:
+        peak = numpy.maximum.accumulate(self.equity) if len(self.equity) else self.equity
+        deviation = self.pnl.std()
+        return {
+            "total_return": float(self.equity[-1] - 1.0) if len(self.equity) else 0.0,
+            "sharpe_per_bar": float(self.pnl.mean() / deviation) if deviation > 0 else 0.0,
+            "max_drawdown": float((1.0 - self.equity / peak).max()) if len(self.equity) else 0.0,
+            "turnover": float(numpy.abs(numpy.diff(self.positions, axis=0, prepend=0.0)).sum()),
+            "costs": float(self.costs.sum()),
+        }
+
+
+class VectorBacktest:
+    """
+    Whole-history backtest for signal research.
+    Loads the feeds the event Engine runs (make_feed, BarFeed, ResampledBarFeed)
+    into aligned matrices, and evaluates a strategy given as a function
+    from the BarMatrix to a (time, symbol) matrix of positions.
+    A strategy prototyped here can then be confirmed by running the Engine
+    on feeds made the same way.
+    """
+    feeds: typing.Dict[str, EventFeed]
+    start_timestamp: datetime.datetime|None = None
+    end_timestamp: datetime.datetime|None = None
+    matrix: BarMatrix|None
+
+    def __init__(self, feeds: typing.Dict[str, EventFeed]):
+        self.feeds = feeds
+        self.matrix = None
+
+    def load(self) -> BarMatrix:
+        if self.matrix is None:
+            bars = {}
+            for symbol, feed in self.feeds.items():
+                batch = load_bars(feed, self.start_timestamp, self.end_timestamp)
+                if batch is not None:
+                    bars[symbol] = batch
+            self.matrix = BarMatrix(bars)
+        return self.matrix
+
+    def run(self, strategy: typing.Callable[[BarMatrix], numpy.ndarray], cost: float = 0.0) -> VectorResult:
+        """
+        Positions only change on the bars of their symbol, as they would in the event engine,
+        in between the last one is held.
+        Cost is charged as a fraction of every change in position.
+        """
+        matrix = self.load()
+        positions = numpy.asarray(strategy(matrix), dtype=numpy.float64)
+        if positions.shape != matrix.close.shape:
+            raise ValueError(f"Strategy returned positions of shape {positions.shape}, expected {matrix.close.shape}")
+        has_bar = ~numpy.isnan(matrix.close)
+        positions = numpy.nan_to_num(forward_fill(numpy.where(has_bar, numpy.nan_to_num(positions), math.nan)))
+        return VectorResult(matrix, positions, cost)
@@ -0,0 +1,148 @@
+import asyncio
+import typing
+
+import numpy
+import pytest
+
+from engine.bar.event import BarBatch, MergedBarBatch
+from engine.bar.feed import BarFeed
+from engine.bar.history import BatchBarHistory
+from engine.data import EventAggregator
+from engine.feed import EventBatch, ns_to_datetime
+
+MINUTE_NS = 60000000000
+
+
+def make_data(timestamps: numpy.ndarray, feed: int) -> BarBatch:
+    count = len(timestamps)
+    # the close encodes feed and row, so every event can be told apart
+    close = feed * 1000000.0 + numpy.arange(count, dtype=numpy.float64)
+    return BarBatch(
+        timestamps=numpy.asarray(timestamps, dtype=numpy.int64),
+        open=close,
+        high=close,
+        low=close,
+        close=close,
+        volume=numpy.ones(count),
+    )
+
+
+def make_timestamps() -> typing.List[numpy.ndarray]:
+    rng = numpy.random.default_rng(0)
+    return [
+        # interleaved feeds with every timestamp shared by some of them
+        numpy.arange(3000) * MINUTE_NS,
+        numpy.arange(2000) * MINUTE_NS + 30 * MINUTE_NS,
+        numpy.sort(rng.choice(5000, 1500, replace=False)) * MINUTE_NS,
+        # one feed running far ahead of the others, and one with a single bar
+        numpy.arange(1000) * MINUTE_NS + 10000 * MINUTE_NS,
+        numpy.array([1234 * MINUTE_NS]),
+    ]
+
+
+class NoSeekBarFeed(BarFeed):
+    def seek(self, timestamp) -> bool:
+        return False
+
+
+def make_aggregator(batch_size: int|None|typing.List[int|None], feed_class: type = BarFeed) -> EventAggregator:
+    aggregator = EventAggregator(asyncio.new_event_loop())
+    for index, timestamps in enumerate(make_timestamps()):
+        feed = feed_class()
+        feed.history = BatchBarHistory(make_data(timestamps, index))
+        feed.batch_size = batch_size[index] if isinstance(batch_size, list) else batch_size
+        aggregator.feeds.append(feed)
+    # and one without any history
+    aggregator.feeds.append(feed_class())
+    return aggregator
+
+
+def expected_events() -> typing.List[typing.Tuple[int, int, float]]:
+    events = []
+    for index, timestamps in enumerate(make_timestamps()):
+        data = make_data(timestamps, index)
+        events.extend(zip(data.timestamps.tolist(), [index] * len(data), data.close.tolist()))
+    # equal timestamps in feed order, a feed in its own order
+    return sorted(events, key=lambda event: (event[0], event[1]))
+
+
+def drain(aggregator: EventAggregator, limit: int|None = None) -> typing.Tuple[list, list]:
+    events = []
+    emitted = []
+    while limit is None or len(events) < limit:
+        event = aggregator.next_historical()
+        if event is None:
+            break
+        emitted.append(event)
+        if isinstance(event, EventBatch):
+            events.extend((bar.ns, aggregator.feeds.index(bar.feed), bar.close) for bar in event)
+        else:
+            events.append((event.ns, aggregator.feeds.index(event.feed), event.close))
+    return events, emitted
+
+
+def run(aggregator: EventAggregator, seek: int|None = None) -> typing.Tuple[list, list]:
+    aggregator.start()
+    if seek is not None:
+        aggregator.seek(ns_to_datetime(seek))
+    result = drain(aggregator)
+    aggregator.stop()
+    aggregator.loop.close()
+    return result
+
+
+def test_merge_order():
+    events, emitted = run(make_aggregator(None))
+    assert events == expected_events()
+    assert not any(isinstance(event, EventBatch) for event in emitted)
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 256, 100000])
+def test_batched_merge_order(batch_size):
+    events, emitted = run(make_aggregator(batch_size))
+    assert events == expected_events()
+    assert all(isinstance(event, EventBatch) for event in emitted)
+    # a block never goes back in time, and never reaches past the next one
+    for previous, following in zip(emitted, emitted[1:]):
+        assert previous.last_ns <= following.ns
+    if batch_size >= EventAggregator.min_slice_size:
+        # interleaved feeds come as merged blocks instead of slices of a few bars
+        assert any(isinstance(event, MergedBarBatch) for event in emitted)
+        assert len(emitted) < len(events) / 10
+
+
+@pytest.mark.parametrize("batch_sizes", [[None, 256, 256, 256, 256], [256, None, 7, None, 256], [256, 256, None, 1000, None]])
+def test_mixed_merge_order(batch_sizes):
+    # single events of some feeds bound the blocks merged from the batches of the others
+    events, _ = run(make_aggregator(batch_sizes))
+    assert events == expected_events()
+
+
+@pytest.mark.parametrize("batch_size", [None, 7, 256])
+@pytest.mark.parametrize("minute", [0, 30, 1234, 2999, 5000, 10500, 20000])
+def test_seek_matches_skip(batch_size, minute):
+    ns = minute * MINUTE_NS
+    expected = [event for event in expected_events() if event[0] >= ns]
+    seeked, _ = run(make_aggregator(batch_size), ns)
+    skipped, _ = run(make_aggregator(batch_size, NoSeekBarFeed), ns)
+    assert seeked == expected
+    assert skipped == expected
+
+
+@pytest.mark.parametrize("batch_size", [None, 7, 256])
+@pytest.mark.parametrize("consumed", [1, 500, 4321])
+def test_snapshot_restore(batch_size, consumed):
+    aggregator = make_aggregator(batch_size)
+    aggregator.start()
+    head, _ = drain(aggregator, consumed)
+    snapshot = aggregator.snapshot()
+    aggregator.stop()
+    aggregator.loop.close()
+
+    restored = make_aggregator(batch_size)
+    restored.start()
+    restored.restore(snapshot)
+    tail, _ = drain(restored)
+    restored.stop()
+    restored.loop.close()
+    assert head + tail == expected_events()
@@ -0,0 +1,150 @@
+from datetime import datetime, timezone
+import os
+from unittest import mock
+
+import numpy
+import pytest
+
+from collect.bar.data import Bar, BarRecords, ChunkedBarFile
+from collect.bar.engine import BarCatalog, BarFrequency, BarReader, BarWriter, list_years
+
+MINUTE = 60
+
+
+def make_records(start: int, count: int, step: int = MINUTE, seed: int = 0) -> numpy.ndarray:
+    rng = numpy.random.default_rng(seed)
+    close = (100.0 + numpy.cumsum(rng.normal(0.0, 0.5, count))) * Bar.FIXED_POINT_MULTIPLIER
+    records = numpy.zeros(count, dtype=Bar.DTYPE)
+    records["timestamp"] = start + numpy.arange(count, dtype=numpy.uint64) * step
+    records["open"] = close
+    records["high"] = close + rng.integers(0, 10**6, count)
+    records["low"] = close - rng.integers(0, 10**6, count)
+    records["close"] = close
+    records["volume"] = rng.integers(0, 10**9, count)
+    return records
+
+
+def timestamp(year: int, month: int = 1, day: int = 1) -> int:
+    return int(datetime(year, month, day, tzinfo=timezone.utc).timestamp())
+
+
+@pytest.mark.parametrize("count", [1, 2, 4095, 4096, 4097])
+def test_chunk_round_trip(count):
+    records = make_records(timestamp(2020), count)
+    # large jumps and values in every field, as deltas go both ways
+    records["timestamp"][count // 2:] += 10**9
+    records["volume"][0] = 2**64 - 1
+    encoded = ChunkedBarFile.encode_chunk(records)
+    numpy.testing.assert_array_equal(ChunkedBarFile.decode_chunk(encoded, count), records)
+
+
+def test_write_read(tmp_path):
+    path = os.path.join(tmp_path, "2020.bar")
+    records = make_records(timestamp(2020), 10000)
+    chunked = ChunkedBarFile.write(path, records, chunk_size=1000)
+    assert len(chunked) == 10000
+    assert list(chunked.index["count"]) == [1000] * 10
+    assert chunked.first_timestamp == records["timestamp"][0]
+    assert chunked.last_timestamp == records["timestamp"][-1]
+    numpy.testing.assert_array_equal(chunked.read(), records)
+    numpy.testing.assert_array_equal(chunked.read(999, 2001), records[999:2001])
+    for index in (0, 1, 999, 1000, 5555, 9999):
+        assert chunked.lower_bound(int(records["timestamp"][index])) == index
+        assert chunked.lower_bound(int(records["timestamp"][index]) - 1) == index
+    assert chunked.lower_bound(int(records["timestamp"][-1]) + 1) == 10000
+
+
+def test_append(tmp_path):
+    path = os.path.join(tmp_path, "2020.bar")
+    records = make_records(timestamp(2020), 10000)
+    ChunkedBarFile.write(path, records[:2500], chunk_size=1000)
+    for start, stop in ((2500, 2600), (2600, 2601), (2601, 7000), (7000, 10000)):
+        ChunkedBarFile(path).append(records[start:stop], chunk_size=1000)
+        chunked = ChunkedBarFile(path)
+        numpy.testing.assert_array_equal(chunked.read(), records[:stop])
+        # the short last chunk is filled up before a new one starts
+        assert (chunked.index["count"][:-1] == 1000).all()
+    assert not os.path.exists(path + ChunkedBarFile.JOURNAL_SUFFIX)
+
+
+def test_failed_append_is_rolled_back(tmp_path):
+    path = os.path.join(tmp_path, "2020.bar")
+    records = make_records(timestamp(2020), 10000)
+    ChunkedBarFile.write(path, records[:2500], chunk_size=1000)
+    with open(path, "rb") as fh:
+        before = fh.read()
+    encode = ChunkedBarFile.encode_chunk
+    with mock.patch.object(ChunkedBarFile, "encode_chunk", side_effect=[encode(records[:1000]), OSError("disk full")]):
+        with pytest.raises(OSError):
+            ChunkedBarFile(path).append(records[2500:], chunk_size=1000)
+    with open(path, "rb") as fh:
+        assert fh.read() == before
+    assert os.listdir(tmp_path) == ["2020.bar"]
+
+
+def test_interrupted_append_is_recovered(tmp_path):
+    path = os.path.join(tmp_path, "2020.bar")
+    records = make_records(timestamp(2020), 10000)
+    ChunkedBarFile.write(path, records[:2500], chunk_size=1000)
+    with open(path, "rb") as fh:
+        before = fh.read()
+    encode = ChunkedBarFile.encode_chunk
+    # the process dies halfway, without rolling back
+    with mock.patch.object(ChunkedBarFile, "recover"), \
+            mock.patch.object(ChunkedBarFile, "encode_chunk", side_effect=[encode(records[:1000]), KeyboardInterrupt()]):
+        with pytest.raises(KeyboardInterrupt):
+            ChunkedBarFile(path).append(records[2500:], chunk_size=1000)
+    assert os.path.exists(path + ChunkedBarFile.JOURNAL_SUFFIX)
+    assert ChunkedBarFile.recover(path)
+    with open(path, "rb") as fh:
+        assert fh.read() == before
+    assert not ChunkedBarFile.recover(path)
+
+
+def test_range_decodes_each_chunk_once(tmp_path):
+    path = os.path.join(tmp_path, "2020.bar")
+    records = make_records(timestamp(2020), 10000)
+    ChunkedBarFile.write(path, records, chunk_size=1000)
+    chunked = ChunkedBarFile(path)
+    with mock.patch.object(ChunkedBarFile, "decode_chunk", wraps=ChunkedBarFile.decode_chunk) as decode:
+        first = chunked.lower_bound(int(records["timestamp"][1500]))
+        stop = chunked.lower_bound(int(records["timestamp"][4500]))
+        numpy.testing.assert_array_equal(chunked.read(first, stop), records[1500:4500])
+    assert decode.call_count == 4
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return BarCatalog(os.path.join(tmp_path, "catalog.json"))
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_store_splits_years(store, compressed):
+    records = make_records(timestamp(2019, 12, 31), 3 * 24 * 60)
+    writer = BarWriter(None, "test", "SYM", compressed=compressed, catalog=store)
+    assert writer.store(BarFrequency.MIN_1, BarRecords(records)) == len(records)
+    assert list_years("test", "SYM", BarFrequency.MIN_1) == [2019, 2020]
+    reader = BarReader(None, "test", "SYM", catalog=store)
+    for year in (2019, 2020):
+        part = reader.read_range(BarFrequency.MIN_1, datetime(year, 1, 1, tzinfo=timezone.utc), datetime(year + 1, 1, 1, tzinfo=timezone.utc))
+        assert (part.records["timestamp"].astype("datetime64[s]").astype("datetime64[Y]").astype(int) + 1970 == year).all()
+    numpy.testing.assert_array_equal(reader.read_all(BarFrequency.MIN_1).records, records)
+    assert reader.count(BarFrequency.MIN_1) == len(records)
+
+
+@pytest.mark.parametrize("compressed", [False, True])
+def test_store_drops_overlap(store, compressed):
+    records = make_records(timestamp(2020, 12, 31), 2 * 24 * 60)
+    writer = BarWriter(None, "test", "SYM", compressed=compressed, catalog=store)
+    assert writer.store(BarFrequency.MIN_1, BarRecords(records[:2000])) == 2000
+    # overlapping, unsorted and duplicated bars, only the newer ones are appended
+    batch = numpy.concatenate((records[2500:], records[1500:2500], records[2400:2600]))
+    assert writer.store(BarFrequency.MIN_1, BarRecords(batch)) == len(records) - 2000
+    assert writer.store(BarFrequency.MIN_1, BarRecords(records[:100])) == 0
+    reader = BarReader(None, "test", "SYM", catalog=store)
+    numpy.testing.assert_array_equal(reader.read_all(BarFrequency.MIN_1).records, records)
+    assert writer.last_timestamp(BarFrequency.MIN_1) == records["timestamp"][-1]
+    series = store.series("test", "SYM", BarFrequency.MIN_1)
+    assert series["count"] == len(records)
+    assert sorted(series["years"]) == ["2020", "2021"]
@@ -0,0 +1,38 @@
+import csv
+import os
+
+import pytest
+
+from engine.bar.history import read_csv_columns
+
+
+def write(tmp_path, text: str) -> str:
+    path = os.path.join(tmp_path, "bars.csv")
+    with open(path, "wb") as fh:
+        fh.write(text.encode("utf-8"))
+    return path
+
+
+def expected_columns(text: str) -> list:
+    rows = list(csv.reader(text.replace("\r\n", "\n").rstrip("\n").split("\n")[1:]))
+    return [list(column) for column in zip(*rows)]
+
+
+@pytest.mark.parametrize("text", [
+    "Date,Open,Close\n2020-01-01,1,2\n2020-01-02,3,4\n",
+    "Date,Open,Close\r\n2020-01-01,1,2\r\n2020-01-02,3,4\r\n",
+    "Date,Open,Close\n2020-01-01,,null\n2020-01-02,3,4",
+    "Date,Open,Close\n\"2020-01-01\",1,2\n2020-01-02,3,4\n",
+])
+def test_columns(tmp_path, text):
+    header, columns = read_csv_columns(write(tmp_path, text))
+    assert header == ["Date", "Open", "Close"]
+    assert [list(column) for column in columns] == expected_columns(text)
+
+
+def test_ragged_rows_do_not_shift_columns(tmp_path):
+    # the short and the long row add up to whole rows of fields
+    text = "Date,Open,Close\n2020-01-01,1\n2020-01-02,3,4,5\n2020-01-03,6,7\n"
+    _, columns = read_csv_columns(write(tmp_path, text))
+    assert list(columns[0]) == ["2020-01-01", "2020-01-02", "2020-01-03"]
+    assert list(columns[1]) == ["1", "3", "6"]
@@ -0,0 +1,140 @@
+import asyncio
+import datetime
+import math
+import typing
+
+import numpy
+import pytest
+
+from engine.bar.event import BarBatch
+from engine.bar.feed import BarFeed
+from engine.bar.history import BatchBarHistory
+from engine.bar.indicator import ATR, EMA, RSI, SMA, Bollinger, IndicatorSet
+from engine.data import EventAggregator
+from engine.engine import Engine
+from engine.feed import ns_to_datetime
+
+
+def make_batch(count: int, nan_rows: typing.List[int]|None = None) -> BarBatch:
+    rng = numpy.random.default_rng(0)
+    close = 100.0 + numpy.cumsum(rng.normal(0.0, 0.5, count))
+    open = numpy.concatenate(([100.0], close[:-1]))
+    spread = numpy.abs(rng.normal(0.0, 0.2, count))
+    batch = BarBatch(
+        timestamps=numpy.arange(count, dtype=numpy.int64) * 60000000000,
+        open=open,
+        high=numpy.maximum(open, close) + spread,
+        low=numpy.minimum(open, close) - spread,
+        close=close,
+        volume=rng.integers(100, 1000, count).astype(numpy.float64),
+    )
+    for row in nan_rows or []:
+        # the shape of a Yahoo null row
+        batch.open[row] = batch.high[row] = batch.low[row] = batch.close[row] = batch.volume[row] = math.nan
+    return batch
+
+
+def make_indicators() -> IndicatorSet:
+    return IndicatorSet({
+        "sma": SMA(20),
+        "bollinger": Bollinger(20),
+        "ema": EMA(10),
+        "rsi": RSI(14),
+        "atr": ATR(14),
+    })
+
+
+NAN_ROWS = [5, 100, 101, 102, 1500, 2999]
+
+
+def compute_in_blocks(batch: BarBatch, size: int) -> dict:
+    indicators = make_indicators()
+    parts = []
+    for start in range(0, len(batch), size):
+        part = batch[start:start + size]
+        indicators.compute(part)
+        parts.append(part.indicators)
+    return {name: numpy.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def test_nan_bar_does_not_poison_values():
+    batch = make_batch(3000, NAN_ROWS)
+    values = compute_in_blocks(batch, len(batch))
+    for name, column in values.items():
+        # after warming up only the very first bars may be missing
+        assert not numpy.isnan(column[200:]).any(), name
+
+
+def test_nan_bar_holds_previous_value():
+    batch = make_batch(3000, NAN_ROWS)
+    values = compute_in_blocks(batch, len(batch))
+    for name, column in values.items():
+        for row in NAN_ROWS:
+            assert column[row] == column[row - 1] or (math.isnan(column[row]) and math.isnan(column[row - 1])), name
+
+
+def test_nan_bars_are_skipped():
+    batch = make_batch(3000, NAN_ROWS)
+    valid = ~numpy.isnan(batch.close)
+    skipped = compute_in_blocks(batch, len(batch))
+    clean = compute_in_blocks(batch[valid], int(valid.sum()))
+    for name in skipped:
+        numpy.testing.assert_allclose(skipped[name][valid], clean[name], rtol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 3000])
+def test_blocks_and_updates_agree(size):
+    batch = make_batch(3000, NAN_ROWS)
+    blocks = compute_in_blocks(batch, size)
+    indicators = make_indicators()
+    updates = {name: [] for name in blocks}
+    for bar in batch:
+        indicators.update(bar)
+        for name, value in bar.indicators.items():
+            updates[name].append(value)
+    for name in blocks:
+        numpy.testing.assert_allclose(blocks[name], updates[name], rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+def test_block_of_only_nan_bars():
+    batch = make_batch(100, list(range(40, 60)))
+    values = compute_in_blocks(batch, 20)
+    for name, column in values.items():
+        assert (column[40:60] == column[39]).all(), name
+
+
+class RecordingEngine(Engine):
+    def __init__(self, loop):
+        super().__init__(loop)
+        self.log = []
+
+    def process(self, event):
+        self.log.append((event.ns, event.indicators))
+
+
+def replay(batch: BarBatch, batch_size: int|None, start: datetime.datetime|None) -> list:
+    loop = asyncio.new_event_loop()
+    feed = BarFeed()
+    feed.history = BatchBarHistory(batch)
+    feed.batch_size = batch_size
+    feed.indicators = make_indicators()
+    aggregator = EventAggregator(loop)
+    aggregator.feeds.append(feed)
+    engine = RecordingEngine(loop)
+    engine.aggregator = aggregator
+    engine.start_timestamp = start
+    engine.run()
+    loop.close()
+    return engine.log
+
+
+@pytest.mark.parametrize("batch_size", [None, 256])
+def test_seek_matches_replay(batch_size):
+    batch = make_batch(3000, NAN_ROWS)
+    start_ns = int(batch.timestamps[1234])
+    full = [entry for entry in replay(batch, batch_size, None) if entry[0] >= start_ns]
+    seeked = replay(batch, batch_size, ns_to_datetime(start_ns))
+    assert [ns for ns, _ in seeked] == [ns for ns, _ in full]
+    for (_, values), (_, expected) in zip(seeked, full):
+        for name in expected:
+            numpy.testing.assert_allclose(values[name], expected[name], rtol=0, atol=0, equal_nan=True)
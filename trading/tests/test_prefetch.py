@@ -0,0 +1,124 @@
+import asyncio
+import os
+
+import numpy
+import pytest
+
+from engine.bar.event import BarBatch
+from engine.bar.feed import BarFeed
+from engine.bar.history import BatchBarHistory
+from engine.bar.prefetch import PrefetchBarHistory
+from engine.data import EventAggregator
+from engine.engine import Engine
+from engine.profiler import Profiler
+
+
+def make_data(count: int, offset: int = 0) -> BarBatch:
+    close = 100.0 + numpy.cumsum(numpy.random.default_rng(offset).normal(0.0, 0.5, count))
+    return BarBatch(
+        timestamps=numpy.arange(count, dtype=numpy.int64) * 60000000000 + offset,
+        open=close,
+        high=close + 1.0,
+        low=close - 1.0,
+        close=close,
+        volume=numpy.ones(count),
+    )
+
+
+def make_feeds(batch_size: int|None) -> list:
+    feeds = []
+    for offset in (0, 30000000000):
+        feed = BarFeed()
+        feed.history = PrefetchBarHistory(BatchBarHistory(make_data(20000, offset)), chunk_size=1000, depth=4)
+        feed.batch_size = batch_size
+        feeds.append(feed)
+    return feeds
+
+
+class Crash(Exception):
+    pass
+
+
+class RecordingEngine(Engine):
+    crash_at: int|None = None
+
+    def __init__(self, loop):
+        super().__init__(loop)
+        self.log = []
+        self.total = 0.0
+
+    def process(self, event):
+        if self.crash_at is not None and self.processed >= self.crash_at:
+            raise Crash()
+        self.log.append((event.ns, self.aggregator.feeds.index(event.feed), event.close))
+        self.total += event.close
+
+    def state(self):
+        return self.total
+
+    def restore_state(self, state):
+        self.total = state
+
+
+def run(path: str, batch_size: int|None, crash_at: int|None = None, resume: bool = False) -> RecordingEngine:
+    loop = asyncio.new_event_loop()
+    aggregator = EventAggregator(loop)
+    aggregator.feeds.extend(make_feeds(batch_size))
+    engine = RecordingEngine(loop)
+    engine.aggregator = aggregator
+    engine.checkpoint_path = path
+    engine.checkpoint_interval = 3333
+    engine.crash_at = crash_at
+    engine.resume = resume
+    try:
+        engine.run()
+    except Crash:
+        aggregator.stop()
+    loop.close()
+    return engine
+
+
+@pytest.mark.parametrize("batch_size", [None, 256])
+def test_checkpoint_round_trip(tmp_path, batch_size):
+    path = os.path.join(tmp_path, "run.checkpoint")
+    full = run(path, batch_size)
+    os.remove(path)
+    crashed = run(path, batch_size, crash_at=len(full.log) * 3 // 5)
+    assert os.path.exists(path)
+    resumed = run(path, batch_size, resume=True)
+    replayed = resumed.processed - len(resumed.log)
+    assert 0 < replayed < len(crashed.log)
+    assert resumed.log == full.log[replayed:]
+    assert resumed.total == pytest.approx(full.total)
+
+
+@pytest.mark.parametrize("consumed", [0, 1, 999, 1000, 1500, 19999, 20000])
+def test_position_restore(consumed):
+    data = make_data(20000)
+    history = PrefetchBarHistory(BatchBarHistory(data), chunk_size=1000, depth=2)
+    history.start()
+    for _ in range(consumed):
+        history.next()
+    position = history.position()
+    history.stop()
+
+    restored = PrefetchBarHistory(BatchBarHistory(data), chunk_size=1000, depth=2)
+    restored.start()
+    assert restored.restore(position)
+    rest = []
+    while (batch := restored.next_batch(700)) is not None:
+        rest.extend(batch.timestamps.tolist())
+    restored.stop()
+    assert rest == data.timestamps[consumed:].tolist()
+
+
+def test_profiler_reaches_wrapped_history():
+    history = PrefetchBarHistory(BatchBarHistory(make_data(5000)), chunk_size=1000)
+    profiler = Profiler()
+    history.profiler = profiler
+    assert history.history.profiler is profiler
+    history.start()
+    while history.next_batch(1000) is not None:
+        pass
+    history.stop()
+    assert profiler.loads["prefetch:BatchBarHistory"].count == 5000
@@ -0,0 +1,64 @@
+import asyncio
+import datetime
+
+import numpy
+import pytest
+
+from engine.bar.event import BarBatch
+from engine.bar.feed import BarFeed
+from engine.bar.history import BatchBarHistory
+from engine.bar.resample import ResampledBarFeed
+from engine.data import EventAggregator
+from engine.engine import Engine
+from engine.feed import ns_to_datetime
+
+MINUTE_NS = 60000000000
+
+
+def make_data(count: int) -> BarBatch:
+    close = 100.0 + numpy.cumsum(numpy.random.default_rng(0).normal(0.0, 0.5, count))
+    return BarBatch(
+        timestamps=numpy.arange(count, dtype=numpy.int64) * MINUTE_NS,
+        open=close,
+        high=close + 1.0,
+        low=close - 1.0,
+        close=close,
+        volume=numpy.ones(count),
+    )
+
+
+class RecordingEngine(Engine):
+    def __init__(self, loop):
+        super().__init__(loop)
+        self.log = []
+
+    def process(self, event):
+        self.log.append((event.ns, event.open, event.high, event.low, event.close, event.volume))
+
+
+def replay(data: BarBatch, start: datetime.datetime|None) -> list:
+    loop = asyncio.new_event_loop()
+    source = BarFeed()
+    source.history = BatchBarHistory(data)
+    aggregator = EventAggregator(loop)
+    aggregator.feeds.append(ResampledBarFeed(source, datetime.timedelta(minutes=5), datetime.timedelta(minutes=1)))
+    engine = RecordingEngine(loop)
+    engine.aggregator = aggregator
+    engine.start_timestamp = start
+    engine.run()
+    loop.close()
+    return engine.log
+
+
+def test_bars_are_stamped_at_close():
+    log = replay(make_data(1000), None)
+    assert [ns for ns, *_ in log] == [(index + 1) * 5 * MINUTE_NS for index in range(200)]
+
+
+@pytest.mark.parametrize("minute", [0, 1, 500, 501, 504, 995, 1000])
+def test_seek_matches_skip(minute):
+    data = make_data(1000)
+    start_ns = minute * MINUTE_NS
+    full = [bar for bar in replay(data, None) if bar[0] >= start_ns]
+    seeked = replay(data, ns_to_datetime(start_ns))
+    assert seeked == full